@@ -0,0 +1,97 @@
+"""时间戳改为 timestamptz 并由数据库生成默认值，补充查询索引
+
+适用于按旧模型（timestamp without time zone、无默认值）建立的库；
+按当前模型新建的库已包含这些变更，执行 alembic stamp head 即可。
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+# 使用 TimestampMixin 的表（created_at / updated_at）
+TIMESTAMP_TABLES = (
+    "users", "sys_param", "sys_menu", "sys_department", "sys_role",
+    "rk_vendor", "rk_vendor_contact", "rk_customer", "rk_customer_contact",
+    "rk_supply", "rk_demand", "rk_match_result", "rk_notice",
+    "task_info", "task_log",
+)
+
+# 其余改为 timestamptz 的可空时间列
+OPTIONAL_DATETIME_COLUMNS = (
+    ("task_info", "last_run_time"),
+    ("task_info", "next_run_time"),
+    ("rk_supply", "price_update_task_date"),
+    ("rk_notice", "read_time"),
+)
+
+# (索引名, 表名, 列)
+INDEXES = (
+    ("ix_supply_vendor_active_status", "rk_supply", ["vendor_id", "active", "analysis_status"]),
+    ("ix_demand_customer_active_status", "rk_demand", ["customer_id", "active", "analysis_status"]),
+    ("ix_match_demand_status", "rk_match_result", ["demand_id", "status"]),
+    ("ix_match_supply_status", "rk_match_result", ["supply_id", "status"]),
+    ("ix_notice_recipient_is_read", "rk_notice", ["recipient_id", "is_read"]),
+    ("ix_vendor_contact_vendor_id", "rk_vendor_contact", ["vendor_id"]),
+    ("ix_customer_contact_customer_id", "rk_customer_contact", ["customer_id"]),
+    ("ix_task_log_task_id_created_at", "task_log", ["task_id", sa.text("created_at DESC")]),
+)
+
+
+def upgrade():
+    for table in TIMESTAMP_TABLES:
+        for column in ("created_at", "updated_at"):
+            # 旧数据由 Python 侧 datetime.utcnow 写入，可能为空，先回填再加 NOT NULL
+            op.execute(f"UPDATE {table} SET {column} = now() AT TIME ZONE 'UTC' WHERE {column} IS NULL")
+            op.alter_column(
+                table, column,
+                type_=sa.DateTime(timezone=True),
+                existing_type=sa.DateTime(),
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+                server_default=sa.text("now()"),
+                nullable=False,
+            )
+
+    for table, column in OPTIONAL_DATETIME_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.DateTime(timezone=True),
+            existing_type=sa.DateTime(),
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+        )
+
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+
+
+def downgrade():
+    for name, table, _ in INDEXES:
+        op.drop_index(name, table_name=table, if_exists=True)
+
+    for table, column in OPTIONAL_DATETIME_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.DateTime(),
+            existing_type=sa.DateTime(timezone=True),
+            postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+        )
+
+    for table in TIMESTAMP_TABLES:
+        for column in ("created_at", "updated_at"):
+            op.alter_column(
+                table, column,
+                type_=sa.DateTime(),
+                existing_type=sa.DateTime(timezone=True),
+                postgresql_using=f"{column} AT TIME ZONE 'UTC'",
+                server_default=None,
+                nullable=True,
+            )
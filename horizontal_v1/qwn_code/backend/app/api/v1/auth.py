@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Optional
+from typing import Optional, Annotated
 import uuid
 from app.schemas.auth import LoginRequest, LoginResponse, RefreshTokenRequest, RefreshTokenResponse, SmsCodeRequest, CaptchaResponse
 from app.services.auth import create_access_token, create_refresh_token, verify_token, AuthService
 from app.core.exceptions import BusinessError, UnauthorizedError
 from app.core.config.settings import settings
+from app.api.v1.common import add_health_route
 
 
 router = APIRouter()
+add_health_route(router, "auth")
 security = HTTPBearer()
 
 
@@ -76,11 +78,6 @@ async def captcha():
     )
 
 
-@router.get("/health")
-async def health_check():
-    return {"status": "ok", "service": "auth"}
-
-
 # 用于保护需要认证的路由的依赖
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """获取当前用户"""
@@ -89,4 +86,8 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     if user_info is None:
         raise UnauthorizedError(message="无效的访问令牌")
 
-    return user_info
\ No newline at end of file
+    return user_info
+
+
+# 模块级依赖声明：同一请求内多处依赖共享一次解析结果
+CurrentUser = Annotated[dict, Depends(get_current_user, use_cache=True)]
\ No newline at end of file
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import ORJSONResponse
 from typing import List
 from app.schemas.base import (
     SysParamCreateRequest, SysParamUpdateRequest, SysParamResponse,
@@ -7,18 +8,20 @@ from app.schemas.base import (
     RoleCreateRequest, RoleUpdateRequest, RoleResponse
 )
 from app.services.base_service import SysParamService, MenuService, DepartmentService, RoleService
-from app.api.v1.auth import get_current_user
+from app.api.v1.auth import CurrentUser
 from app.core.exceptions import BusinessError
+from app.api.v1.common import add_health_route
 
 
 router = APIRouter()
+add_health_route(router, "base")
 
 
 # 系统参数相关接口
 @router.post("/sys/param", response_model=SysParamResponse)
 async def create_sys_param(
     request: SysParamCreateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """创建系统参数"""
     # 检查是否有权限
@@ -29,23 +32,24 @@ async def create_sys_param(
     return await SysParamService.create_param(param_data)
 
 
-@router.get("/sys/param/{param_id}", response_model=SysParamResponse)
+@router.get("/sys/param/{param_id}", response_model=None, responses={200: {"model": SysParamResponse}})
 async def get_sys_param(
     param_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """获取系统参数"""
     param = await SysParamService.get_param_by_id(param_id)
     if not param:
         raise BusinessError(message="参数不存在", code=10034)
-    return param
+    # 数据来自数据库，跳过 response_model 的二次校验直接序列化
+    return ORJSONResponse(param.model_dump(by_alias=True))
 
 
 @router.put("/sys/param/{param_id}", response_model=SysParamResponse)
 async def update_sys_param(
     param_id: int,
     request: SysParamUpdateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """更新系统参数"""
     if not current_user.get("is_superuser", False):
@@ -61,7 +65,7 @@ async def update_sys_param(
 @router.delete("/sys/param/{param_id}")
 async def delete_sys_param(
     param_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """删除系统参数"""
     if not current_user.get("is_superuser", False):
@@ -73,20 +77,20 @@ async def delete_sys_param(
     return {"code": 1000, "message": "删除成功"}
 
 
-@router.get("/sys/param/key/{key_name}", response_model=SysParamResponse)
+@router.get("/sys/param/key/{key_name}", response_model=None, responses={200: {"model": SysParamResponse}})
 async def get_sys_param_by_key(key_name: str):
     """根据键名获取系统参数（公开接口）"""
     param = await SysParamService.get_param_by_key(key_name)
     if not param:
         raise BusinessError(message="参数不存在", code=10034)
-    return param
+    return ORJSONResponse(param.model_dump(by_alias=True))
 
 
 # 菜单相关接口
 @router.post("/sys/menu", response_model=MenuResponse)
 async def create_menu(
     request: MenuCreateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """创建菜单"""
     if not current_user.get("is_superuser", False):
@@ -96,18 +100,18 @@ async def create_menu(
     return await MenuService.create_menu(menu_data)
 
 
-@router.get("/sys/menu/tree", response_model=MenuTreeResponse)
-async def get_menu_tree(current_user: dict = Depends(get_current_user)):
+@router.get("/sys/menu/tree", response_model=None, responses={200: {"model": MenuTreeResponse}})
+async def get_menu_tree(current_user: CurrentUser):
     """获取菜单树"""
     menus = await MenuService.get_menu_tree()
-    return MenuTreeResponse(items=menus)
+    return ORJSONResponse({"items": [menu.model_dump(by_alias=True) for menu in menus]})
 
 
 @router.put("/sys/menu/{menu_id}", response_model=MenuResponse)
 async def update_menu(
     menu_id: int,
     request: MenuUpdateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """更新菜单"""
     if not current_user.get("is_superuser", False):
@@ -123,7 +127,7 @@ async def update_menu(
 @router.delete("/sys/menu/{menu_id}")
 async def delete_menu(
     menu_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """删除菜单"""
     if not current_user.get("is_superuser", False):
@@ -139,7 +143,7 @@ async def delete_menu(
 @router.post("/sys/department", response_model=DepartmentResponse)
 async def create_department(
     request: DepartmentCreateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """创建部门"""
     if not current_user.get("is_superuser", False):
@@ -149,20 +153,20 @@ async def create_department(
     return await DepartmentService.create_department(dept_data)
 
 
-@router.get("/sys/department/{dept_id}", response_model=DepartmentResponse)
+@router.get("/sys/department/{dept_id}", response_model=None, responses={200: {"model": DepartmentResponse}})
 async def get_department(dept_id: int):
     """获取部门"""
     dept = await DepartmentService.get_department_by_id(dept_id)
     if not dept:
         raise BusinessError(message="部门不存在", code=10034)
-    return dept
+    return ORJSONResponse(dept.model_dump(by_alias=True))
 
 
 @router.put("/sys/department/{dept_id}", response_model=DepartmentResponse)
 async def update_department(
     dept_id: int,
     request: DepartmentUpdateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """更新部门"""
     if not current_user.get("is_superuser", False):
@@ -178,7 +182,7 @@ async def update_department(
 @router.delete("/sys/department/{dept_id}")
 async def delete_department(
     dept_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """删除部门"""
     if not current_user.get("is_superuser", False):
@@ -194,7 +198,7 @@ async def delete_department(
 @router.post("/sys/role", response_model=RoleResponse)
 async def create_role(
     request: RoleCreateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """创建角色"""
     if not current_user.get("is_superuser", False):
@@ -204,20 +208,20 @@ async def create_role(
     return await RoleService.create_role(role_data)
 
 
-@router.get("/sys/role/{role_id}", response_model=RoleResponse)
+@router.get("/sys/role/{role_id}", response_model=None, responses={200: {"model": RoleResponse}})
 async def get_role(role_id: int):
     """获取角色"""
     role = await RoleService.get_role_by_id(role_id)
     if not role:
         raise BusinessError(message="角色不存在", code=10034)
-    return role
+    return ORJSONResponse(role.model_dump(by_alias=True))
 
 
 @router.put("/sys/role/{role_id}", response_model=RoleResponse)
 async def update_role(
     role_id: int,
     request: RoleUpdateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """更新角色"""
     if not current_user.get("is_superuser", False):
@@ -233,7 +237,7 @@ async def update_role(
 @router.delete("/sys/role/{role_id}")
 async def delete_role(
     role_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """删除角色"""
     if not current_user.get("is_superuser", False):
@@ -243,8 +247,3 @@ async def delete_role(
     if not success:
         raise BusinessError(message="角色不存在", code=10034)
     return {"code": 1000, "message": "删除成功"}
-
-
-@router.get("/health")
-async def health_check():
-    return {"status": "ok", "service": "base"}
\ No newline at end of file
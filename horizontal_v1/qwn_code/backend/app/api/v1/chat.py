@@ -1,26 +1,34 @@
 from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
 from app.schemas.chat import ChatMessageRequest, ChatMessageResponse, ChatHistoryRequest, ChatHistoryResponse, ConversationListRequest, ConversationListResponse
 from app.services.chat_service import ChatService
-from app.api.v1.auth import get_current_user
+from app.api.v1.auth import CurrentUser
+from app.api.v1.common import add_health_route
 
 
 router = APIRouter()
+add_health_route(router, "chat")
 chat_service = ChatService()
 
 
 @router.post("/completion", response_model=ChatMessageResponse)
 async def chat_completion(
     request: ChatMessageRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
-    """聊天补全接口"""
-    return await chat_service.chat_completion(request)
+    """聊天补全接口（response_mode 为 streaming 时以 SSE 逐段返回回答）"""
+    if request.response_mode == "streaming":
+        return StreamingResponse(
+            chat_service.stream_chat_completion(request),
+            media_type="text/event-stream"
+        )
+    return await chat_service.chat_completion(request, user_id=str(current_user["id"]))
 
 
 @router.post("/history", response_model=ChatHistoryResponse)
 async def get_chat_history(
     request: ChatHistoryRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """获取聊天历史"""
     return await chat_service.get_chat_history(request)
@@ -29,7 +37,7 @@ async def get_chat_history(
 @router.post("/conversations", response_model=ConversationListResponse)
 async def get_conversations_list(
     request: ConversationListRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """获取会话列表"""
     result = await chat_service.get_conversations_list(
@@ -41,6 +49,17 @@ async def get_conversations_list(
     return ConversationListResponse(**result)
 
 
-@router.get("/health")
-async def health_check():
-    return {"status": "ok", "service": "chat"}
\ No newline at end of file
+@router.post("/conversations/stream")
+async def stream_conversations_list(
+    request: ConversationListRequest,
+    current_user: CurrentUser
+):
+    """以 NDJSON 流式获取会话列表"""
+    return StreamingResponse(
+        chat_service.stream_conversations_list(
+            user_id=current_user.get("id", "default_user"),
+            limit=request.limit,
+            offset=request.offset
+        ),
+        media_type="application/x-ndjson"
+    )
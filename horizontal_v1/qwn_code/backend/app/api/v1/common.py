@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Request, Response
+import orjson
+
+
+def add_health_route(router: APIRouter, service: str) -> None:
+    """为路由注册 GET /health（原生 Starlette 路由，不经过依赖解析与响应校验，响应体预先序列化）"""
+    body = orjson.dumps({"status": "ok", "service": service})
+
+    async def health_check(request: Request) -> Response:
+        return Response(body, media_type="application/json")
+
+    router.add_route("/health", health_check, methods=["GET"], include_in_schema=False)
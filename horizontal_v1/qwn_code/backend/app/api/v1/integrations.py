@@ -1,9 +1,6 @@
 from fastapi import APIRouter
+from app.api.v1.common import add_health_route
 
 
 router = APIRouter()
-
-
-@router.get("/health")
-async def health_check():
-    return {"status": "ok", "service": "integrations"}
\ No newline at end of file
+add_health_route(router, "integrations")
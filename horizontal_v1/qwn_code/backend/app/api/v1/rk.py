@@ -10,18 +10,20 @@ from app.schemas.rk import (
 from app.services.rk_service import (
     VendorService, CustomerService, SupplyService, DemandService, MatchService
 )
-from app.api.v1.auth import get_current_user
+from app.api.v1.auth import CurrentUser
 from app.core.exceptions import BusinessError
+from app.api.v1.common import add_health_route
 
 
 router = APIRouter()
+add_health_route(router, "rk")
 
 
 # 供应商相关接口
 @router.post("/vendor", response_model=VendorResponse)
 async def create_vendor(
     request: VendorCreateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """创建供应商"""
     vendor_data = request.model_dump()
@@ -41,7 +43,7 @@ async def get_vendor(vendor_id: int):
 async def update_vendor(
     vendor_id: int,
     request: VendorUpdateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """更新供应商"""
     update_data = request.model_dump(exclude_unset=True)
@@ -54,7 +56,7 @@ async def update_vendor(
 @router.delete("/vendor/{vendor_id}")
 async def delete_vendor(
     vendor_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """删除供应商"""
     success = await VendorService.delete_vendor(vendor_id)
@@ -67,7 +69,7 @@ async def delete_vendor(
 @router.post("/customer", response_model=CustomerResponse)
 async def create_customer(
     request: CustomerCreateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """创建客户"""
     customer_data = request.model_dump()
@@ -87,7 +89,7 @@ async def get_customer(customer_id: int):
 async def update_customer(
     customer_id: int,
     request: CustomerUpdateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """更新客户"""
     update_data = request.model_dump(exclude_unset=True)
@@ -100,7 +102,7 @@ async def update_customer(
 @router.delete("/customer/{customer_id}")
 async def delete_customer(
     customer_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """删除客户"""
     success = await CustomerService.delete_customer(customer_id)
@@ -113,7 +115,7 @@ async def delete_customer(
 @router.post("/supply", response_model=SupplyResponse)
 async def create_supply(
     request: SupplyCreateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """创建简历"""
     supply_data = request.model_dump()
@@ -133,7 +135,7 @@ async def get_supply(supply_id: int):
 async def update_supply(
     supply_id: int,
     request: SupplyUpdateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """更新简历"""
     update_data = request.model_dump(exclude_unset=True)
@@ -146,7 +148,7 @@ async def update_supply(
 @router.delete("/supply/{supply_id}")
 async def delete_supply(
     supply_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """删除简历"""
     success = await SupplyService.delete_supply(supply_id)
@@ -158,7 +160,7 @@ async def delete_supply(
 @router.post("/supply/{supply_id}/analysis", response_model=AnalysisResponse)
 async def trigger_supply_analysis(
     supply_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """触发简历分析"""
     return await SupplyService.trigger_analysis(supply_id)
@@ -168,7 +170,7 @@ async def trigger_supply_analysis(
 @router.post("/demand", response_model=DemandResponse)
 async def create_demand(
     request: DemandCreateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """创建需求"""
     demand_data = request.model_dump()
@@ -188,7 +190,7 @@ async def get_demand(demand_id: int):
 async def update_demand(
     demand_id: int,
     request: DemandUpdateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """更新需求"""
     update_data = request.model_dump(exclude_unset=True)
@@ -201,7 +203,7 @@ async def update_demand(
 @router.delete("/demand/{demand_id}")
 async def delete_demand(
     demand_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """删除需求"""
     success = await DemandService.delete_demand(demand_id)
@@ -214,12 +216,7 @@ async def delete_demand(
 @router.post("/match", response_model=MatchResponse)
 async def perform_match(
     request: MatchRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """执行匹配"""
     return await MatchService.perform_match(request)
-
-
-@router.get("/health")
-async def health_check():
-    return {"status": "ok", "service": "rk"}
\ No newline at end of file
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import StreamingResponse, ORJSONResponse
 from typing import List
 from app.schemas.task import (
     TaskCreateRequest, TaskUpdateRequest, TaskResponse, 
@@ -7,18 +8,20 @@ from app.schemas.task import (
     TaskLogRequest, TaskLogResponse
 )
 from app.services.task_service import TaskService
-from app.api.v1.auth import get_current_user
+from app.api.v1.auth import CurrentUser
 from app.core.exceptions import BusinessError
+from app.api.v1.common import add_health_route
 
 
 router = APIRouter()
+add_health_route(router, "task")
 task_service = TaskService()
 
 
 @router.post("/", response_model=TaskResponse)
 async def create_task(
     request: TaskCreateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """创建任务"""
     if not current_user.get("is_superuser", False):
@@ -28,20 +31,21 @@ async def create_task(
     return await TaskService.create_task(task_data)
 
 
-@router.get("/{task_id}", response_model=TaskResponse)
+@router.get("/{task_id}", response_model=None, responses={200: {"model": TaskResponse}})
 async def get_task(task_id: int):
     """获取任务"""
     task = await TaskService.get_task_by_id(task_id)
     if not task:
         raise BusinessError(message="任务不存在", code=10034)
-    return task
+    # 数据来自数据库，跳过 response_model 的二次校验直接序列化
+    return ORJSONResponse(task.model_dump(by_alias=True))
 
 
 @router.put("/{task_id}", response_model=TaskResponse)
 async def update_task(
     task_id: int,
     request: TaskUpdateRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """更新任务"""
     if not current_user.get("is_superuser", False):
@@ -57,7 +61,7 @@ async def update_task(
 @router.delete("/{task_id}")
 async def delete_task(
     task_id: int,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """删除任务"""
     if not current_user.get("is_superuser", False):
@@ -69,25 +73,29 @@ async def delete_task(
     return {"code": 1000, "message": "删除成功"}
 
 
-@router.get("/", response_model=List[TaskResponse])
-async def get_tasks():
-    """获取所有任务"""
-    return await TaskService.get_all_tasks()
+@router.get("/", response_model=None, responses={200: {"model": List[TaskResponse]}})
+async def get_tasks(skip: int = Query(0, ge=0), limit: int = Query(100, ge=1, le=500)):
+    """分页获取任务"""
+    tasks = await TaskService.get_all_tasks(skip, limit)
+    return ORJSONResponse([task.model_dump(by_alias=True) for task in tasks])
 
 
 @router.post("/execute", response_model=TaskExecuteResponse)
 async def execute_task_once(
     request: TaskExecuteRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """执行任务一次"""
+    if not current_user.get("is_superuser", False):
+        raise BusinessError(message="没有权限执行任务", code=10033)
+    
     return await TaskService.execute_task_once(request.task_id)
 
 
 @router.post("/start", response_model=TaskControlResponse)
 async def start_task(
     request: TaskControlRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """启动任务"""
     if not current_user.get("is_superuser", False):
@@ -99,7 +107,7 @@ async def start_task(
 @router.post("/stop", response_model=TaskControlResponse)
 async def stop_task(
     request: TaskControlRequest,
-    current_user: dict = Depends(get_current_user)
+    current_user: CurrentUser
 ):
     """暂停任务"""
     if not current_user.get("is_superuser", False):
@@ -108,19 +116,32 @@ async def stop_task(
     return await TaskService.stop_task(request.task_id)
 
 
-@router.post("/logs", response_model=TaskLogResponse)
+@router.post("/logs", response_model=None, responses={200: {"model": TaskLogResponse}})
 async def get_task_logs(
     request: TaskLogRequest,
-    current_user: dict = Depends(get_current_user)
-):
-    """获取任务日志"""
-    return await TaskService.get_task_logs(
+    current_user: CurrentUser
+) -> Response:
+    """获取任务日志（TaskLogResponse 仅用于接口文档，响应体由服务层直接编码）"""
+    body = await TaskService.get_task_logs_json(
         task_id=request.task_id,
         page=request.page,
         size=request.size
     )
+    return Response(content=body, media_type="application/json")
 
 
-@router.get("/health")
-async def health_check():
-    return {"status": "ok", "service": "task"}
\ No newline at end of file
+
+@router.post("/logs/stream")
+async def stream_task_logs(
+    request: TaskLogRequest,
+    current_user: CurrentUser
+):
+    """以 NDJSON 流式获取任务日志"""
+    return StreamingResponse(
+        TaskService.stream_task_logs(
+            task_id=request.task_id,
+            page=request.page,
+            size=request.size
+        ),
+        media_type="application/x-ndjson"
+    )
\ No newline at end of file
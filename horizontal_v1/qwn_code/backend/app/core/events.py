@@ -1,16 +1,30 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 import logging
+from logging.handlers import QueueHandler
 from app.core.config.settings import settings
+from app.core.middlewares import DeferredQueueHandler, log_queue
 from app.db.session import init_db, close_db
 from app.db.redis import init_redis, close_redis
+from app.services.dify_client import dify_client
+from app.services.rk_service import close_analysis_client
+from app.services.task_service import shutdown_task_pool
+
+
+def setup_logging() -> QueueHandler:
+    """将根日志记录器接入请求日志的队列，由同一个后台线程负责格式化与写盘"""
+    queue_handler = DeferredQueueHandler(log_queue)
+    root_logger = logging.getLogger()
+    root_logger.addHandler(queue_handler)
+    root_logger.setLevel(settings.LOG_LEVEL)
+    return queue_handler
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """应用生命周期管理"""
     # 启动时的操作
-    logging.basicConfig(level=getattr(logging, settings.LOG_LEVEL))
+    log_handler = setup_logging()
     logger = logging.getLogger(__name__)
     logger.info("Starting up Work Assistant API...")
 
@@ -29,4 +43,16 @@ async def lifespan(app: FastAPI):
     await close_db()
 
     # 关闭Redis连接
-    await close_redis()
\ No newline at end of file
+    await close_redis()
+
+    # 关闭 Dify 共享 HTTP 客户端
+    await dify_client.aclose()
+
+    # 关闭第三方分析服务客户端
+    await close_analysis_client()
+
+    # 关闭任务线程池
+    shutdown_task_pool()
+
+    # 移除根日志处理器（后台线程在进程退出时写完剩余记录后停止）
+    logging.getLogger().removeHandler(log_handler)
\ No newline at end of file
@@ -1,12 +1,12 @@
-from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi import Request
+from fastapi.responses import ORJSONResponse
 from typing import Union
 import traceback
 from app.core.config.settings import settings
 import json
 import datetime
 import decimal
-import uuid
+import os
 from sqlalchemy.exc import SQLAlchemyError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 from fastapi.exceptions import RequestValidationError
@@ -88,107 +88,51 @@ def create_response(code: int, message: str, result=None, request_id: str = None
     return response_data
 
 
-async def business_error_handler(request: Request, exc: BusinessError):
-    """业务异常处理器"""
-    request_id = getattr(request.state, 'request_id', str(uuid.uuid4()))
-    return JSONResponse(
-        status_code=exc.status_code,
-        content=create_response(exc.code, exc.message, request_id=request_id)
-    )
-
-
-async def unauthorized_error_handler(request: Request, exc: UnauthorizedError):
-    """未授权异常处理器"""
-    request_id = getattr(request.state, 'request_id', str(uuid.uuid4()))
-    return JSONResponse(
-        status_code=exc.status_code,
-        content=create_response(exc.code, exc.message, request_id=request_id)
-    )
-
-
-async def forbidden_error_handler(request: Request, exc: ForbiddenError):
-    """禁止访问异常处理器"""
-    request_id = getattr(request.state, 'request_id', str(uuid.uuid4()))
-    return JSONResponse(
-        status_code=exc.status_code,
-        content=create_response(exc.code, exc.message, request_id=request_id)
-    )
-
-
-async def validation_error_handler(request: Request, exc: RequestValidationError):
-    """请求参数校验异常处理器"""
-    request_id = getattr(request.state, 'request_id', str(uuid.uuid4()))
-    return JSONResponse(
-        status_code=422,
-        content=create_response(
-            422, 
-            "Validation Error", 
-            {"detail": exc.errors()}, 
-            request_id=request_id
-        )
-    )
-
-
-async def sql_alchemy_error_handler(request: Request, exc: SQLAlchemyError):
-    """数据库异常处理器"""
-    request_id = getattr(request.state, 'request_id', str(uuid.uuid4()))
-    return JSONResponse(
-        status_code=500,
-        content=create_response(
-            500, 
-            "Database Error", 
-            request_id=request_id
-        )
-    )
-
-
-async def http_error_handler(request: Request, exc: StarletteHTTPException):
-    """HTTP异常处理器"""
-    request_id = getattr(request.state, 'request_id', str(uuid.uuid4()))
-    
-    # 根据HTTP状态码返回相应的错误信息
+def _http_error_info(exc: StarletteHTTPException):
+    """根据HTTP状态码返回相应的错误信息"""
     if exc.status_code == 404:
-        return JSONResponse(
-            status_code=200,
-            content=create_response(10034, "Not Found", request_id=request_id)
-        )
+        return 200, 10034, "Not Found", None
     elif exc.status_code == 405:
-        return JSONResponse(
-            status_code=200,
-            content=create_response(10034, "Method Not Allowed", request_id=request_id)
-        )
+        return 200, 10034, "Method Not Allowed", None
     elif exc.status_code == 429:
-        return JSONResponse(
-            status_code=429,
-            content=create_response(429, "Rate Limit Exceeded", request_id=request_id)
-        )
-    else:
-        return JSONResponse(
-            status_code=exc.status_code,
-            content=create_response(exc.status_code, exc.detail, request_id=request_id)
-        )
-
-
-async def general_exception_handler(request: Request, exc: Exception):
-    """通用异常处理器"""
-    request_id = getattr(request.state, 'request_id', str(uuid.uuid4()))
+        return 429, 429, "Rate Limit Exceeded", None
+    return exc.status_code, exc.status_code, exc.detail, None
+
+
+def _general_error_info(exc: Exception):
+    """通用异常：记录堆栈后返回统一的服务器错误"""
     print(f"Exception occurred: {exc}\n{traceback.format_exc()}")
-    return JSONResponse(
-        status_code=500,
-        content=create_response(
-            500, 
-            "Internal Server Error", 
-            request_id=request_id
-        )
+    return 500, 500, "Internal Server Error", None
+
+
+# 异常类型 -> (HTTP状态码, 业务码, 提示信息, result) 的分发表
+_EXC_MAP = {
+    BusinessError: lambda exc: (exc.status_code, exc.code, exc.message, None),
+    UnauthorizedError: lambda exc: (exc.status_code, exc.code, exc.message, None),
+    ForbiddenError: lambda exc: (exc.status_code, exc.code, exc.message, None),
+    RequestValidationError: lambda exc: (422, 422, "Validation Error", {"detail": exc.errors()}),
+    SQLAlchemyError: lambda exc: (500, 500, "Database Error", None),
+    StarletteHTTPException: _http_error_info,
+    Exception: _general_error_info,
+}
+
+
+async def unified_exception_handler(request: Request, exc: Exception):
+    """统一异常处理器，按异常类型查表生成响应"""
+    request_id = getattr(request.state, 'request_id', None) or os.urandom(16).hex()
+    # 按 MRO 查找，以便子类异常复用父类的处理规则
+    for cls in type(exc).__mro__:
+        info = _EXC_MAP.get(cls)
+        if info is not None:
+            break
+    status_code, code, message, result = info(exc)
+    # 供请求日志中间件记录业务码，避免其解析响应体
+    request.state.response_code = code
+    return ORJSONResponse(
+        status_code=status_code,
+        content=create_response(code, message, result, request_id=request_id)
     )
 
 
-def register_exception_handlers(app: FastAPI):
-    """注册异常处理器"""
-    app.add_exception_handler(BusinessError, business_error_handler)
-    app.add_exception_handler(UnauthorizedError, unauthorized_error_handler)
-    app.add_exception_handler(ForbiddenError, forbidden_error_handler)
-    app.add_exception_handler(RequestValidationError, validation_error_handler)
-    app.add_exception_handler(SQLAlchemyError, sql_alchemy_error_handler)
-    app.add_exception_handler(StarletteHTTPException, http_error_handler)
-    app.add_exception_handler(Exception, general_exception_handler)
\ No newline at end of file
+# 注册表：创建应用时一次性传给 FastAPI(exception_handlers=...)
+EXCEPTION_HANDLERS = {exc_class: unified_exception_handler for exc_class in _EXC_MAP}
\ No newline at end of file
@@ -1,35 +1,57 @@
-import json
-import time
-import uuid
+import orjson
+from time import perf_counter
 from typing import Callable, Awaitable
 from fastapi import Request, Response
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from app.core.config.settings import settings
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+import atexit
 import os
+import queue
 from pythonjsonlogger import jsonlogger
-import traceback
 from pydantic import BaseModel
 
 
-class CustomLogger(logging.Logger):
-    """自定义日志记录器"""
-    def __init__(self, name: str):
-        super().__init__(name)
+class DeferredQueueHandler(QueueHandler):
+    """只做入队的日志处理器
 
-    def info(self, msg, *args, **kwargs):
-        kwargs['extra'] = kwargs.get('extra') or {}
-        extra = {}
-        kwargs['extra'].update(extra)
-        super().info(msg, *args, **kwargs)
+    队列仅在进程内传递记录，无需像默认实现那样预先格式化以便序列化，
+    因此格式化（jsonlogger）完全留给后台监听线程执行。
+    """
+    def prepare(self, record):
+        return record
 
-    def error(self, msg, *args, **kwargs):
-        kwargs['extra'] = kwargs.get('extra') or {}
-        extra = {}
-        kwargs['extra'].update(extra)
-        super().error(msg, *args, **kwargs)
 
+class _LazyHeaders:
+    """延迟物化的请求头，仅在日志记录真正被序列化时才转换为 dict"""
+    __slots__ = ("headers",)
+
+    def __init__(self, headers):
+        self.headers = headers
+
+    def __repr__(self):
+        return repr(dict(self.headers))
+
+
+_fallback_encoder = jsonlogger.JsonEncoder()
+
+
+def _log_json_default(obj):
+    """处理 orjson 无法原生序列化的对象，其余沿用 jsonlogger 的规则"""
+    if isinstance(obj, _LazyHeaders):
+        return dict(obj.headers)
+    return _fallback_encoder.default(obj)
+
+
+def _log_json_dumps(obj, default=None, **kwargs):
+    """基于 orjson 的日志序列化（jsonlogger 需要返回 str）"""
+    return orjson.dumps(obj, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
+
+
+# 请求ID头在进程生命周期内不变，预先解析并编码
+_REQ_ID_HEADER = settings.REQUEST_ID_HEADER
+_REQ_ID_HEADER_BYTES = _REQ_ID_HEADER.encode()
 
 # 创建日志目录
 log_directory = "logs"
@@ -45,13 +67,24 @@ file_handler = RotatingFileHandler(
 file_handler.setLevel(logging.DEBUG)
 
 # 配置日志记录器
-logger = CustomLogger("work_assistant_log")
+logger = logging.getLogger("work_assistant_log")
 logger.setLevel(logging.DEBUG)
 handler = logging.StreamHandler()
-formatter = jsonlogger.JsonFormatter('%(asctime)s %(levelname)s %(name)s %(message)s')
+formatter = jsonlogger.JsonFormatter(
+    '%(asctime)s %(levelname)s %(name)s %(message)s',
+    json_default=_log_json_default,
+    json_serializer=_log_json_dumps,
+)
 handler.setFormatter(formatter)
-logger.addHandler(handler)
-logger.addHandler(file_handler)
+
+# 请求路径只做入队，格式化与文件/控制台写入由后台线程完成
+log_queue = queue.SimpleQueue()
+log_listener = QueueListener(log_queue, handler, file_handler, respect_handler_level=True)
+log_listener.start()
+atexit.register(log_listener.stop)
+logger.addHandler(DeferredQueueHandler(log_queue))
+# 已有独立的输出处理器，不再向根日志记录器重复传播
+logger.propagate = False
 
 
 class RequestLoggingMiddleware:
@@ -67,36 +100,36 @@ class RequestLoggingMiddleware:
         request = Request(scope)
 
         # 获取或生成 request_id
-        request_id = request.headers.get(settings.REQUEST_ID_HEADER) or str(uuid.uuid4())
+        request_id = request.headers.get(_REQ_ID_HEADER) or os.urandom(16).hex()
 
         # 添加 request_id 到请求状态，以便在后续处理中使用
         request.state.request_id = request_id
+        request_id_bytes = request_id.encode()
 
-        start_time = time.time()
+        start_time = perf_counter()
 
-        # 记录请求开始
-        logger.info(
-            "Request started",
-            extra={
-                "request_id": request_id,
-                "method": request.method,
-                "path": str(request.url),
-                "headers": dict(request.headers),
-            }
-        )
+        # 记录请求开始（日志级别不输出 INFO 时不构建 extra）
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Request started",
+                extra={
+                    "request_id": request_id,
+                    "method": request.method,
+                    "path": str(request.url),
+                    "headers": _LazyHeaders(request.headers),
+                }
+            )
 
-        # 捕获响应
-        response_body = b""
+        # 响应状态码直接取自 http.response.start，无需缓冲和解析响应体
+        status_code = 200
 
         async def send_wrapper(message):
-            if message["type"] == "http.response.body":
-                nonlocal response_body
-                response_body += message.get("body", b"")
-
             # 在响应头中添加 request_id
             if message["type"] == "http.response.start":
+                nonlocal status_code
+                status_code = message["status"]
                 headers = message.get("headers", [])
-                headers.append((settings.REQUEST_ID_HEADER.encode(), request_id.encode()))
+                headers.append((_REQ_ID_HEADER_BYTES, request_id_bytes))
                 message["headers"] = headers
 
             await send(message)
@@ -104,19 +137,21 @@ class RequestLoggingMiddleware:
         try:
             await self.app(scope, receive, send_wrapper)
         except Exception as e:
-            duration = time.time() - start_time
+            duration = perf_counter() - start_time
+            # 交由日志框架在真正输出时才格式化堆栈
             logger.error(
-                f"Unhandled exception in request: {str(e)}",
+                "Unhandled exception in request: %s",
+                e,
+                exc_info=e,
                 extra={
                     "request_id": request_id,
                     "method": request.method,
                     "path": str(request.url),
                     "duration": duration,
-                    "exception": traceback.format_exc(),
                 }
             )
             # 发送错误响应
-            response = JSONResponse(
+            response = ORJSONResponse(
                 status_code=500,
                 content={
                     "message": "Internal Server Error",
@@ -126,21 +161,16 @@ class RequestLoggingMiddleware:
             )
             await response(scope, receive, send)
         else:
-            duration = time.time() - start_time
-            # 记录请求结束
-            try:
-                response_content = json.loads(response_body.decode()) if response_body else {}
-                response_code = response_content.get("code", 200)
-            except json.JSONDecodeError:
-                response_code = 200
-
+            duration = perf_counter() - start_time
+            # 记录请求结束（业务码由异常处理器写入 request.state）
             logger.info(
                 "Request completed",
                 extra={
                     "request_id": request_id,
                     "method": request.method,
                     "path": str(request.url),
-                    "status_code": response_code,
+                    "status_code": status_code,
+                    "code": getattr(request.state, "response_code", None),
                     "duration": duration,
                 }
             )
@@ -0,0 +1,139 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert as sa_insert, update as sa_update, delete as sa_delete
+from sqlalchemy.future import select
+from typing import Optional, List, Generic, TypeVar, ClassVar, Tuple, Any
+
+ModelT = TypeVar("ModelT")
+
+# 批量导入达到该条数时改用 COPY
+COPY_THRESHOLD = 100
+
+
+class BaseDAO(Generic[ModelT]):
+    """通用数据访问对象
+
+    子类只需声明 model，按需声明 order_by（默认排序）、覆盖 _load_options（预加载选项），
+    再补充各自的专用查询方法即可。
+    """
+
+    model: ClassVar[type]
+    order_by: ClassVar[Tuple[Any, ...]] = ()
+
+    @classmethod
+    def _load_options(cls) -> Tuple[Any, ...]:
+        """查询时附加的预加载选项（调用时才构造，避免导入阶段触发 mapper 配置）"""
+        return ()
+
+    @classmethod
+    async def get_by_id(cls, db: AsyncSession, obj_id: int) -> Optional[ModelT]:
+        """根据ID获取记录"""
+        # session.get 先查会话的 identity map，未命中才发起主键查询
+        return await db.get(cls.model, obj_id, options=cls._load_options())
+
+    @classmethod
+    async def get_many_by_ids(cls, db: AsyncSession, obj_ids: List[int]) -> List[ModelT]:
+        """批量根据ID获取记录：一条 IN 查询，结果按传入顺序返回（不存在的ID跳过）"""
+        obj_ids = list(dict.fromkeys(obj_ids))
+        if not obj_ids:
+            return []
+        stmt = select(cls.model).options(*cls._load_options()).where(cls.model.id.in_(obj_ids))
+        result = await db.execute(stmt)
+        found = {obj.id: obj for obj in result.scalars().unique()}
+        return [found[obj_id] for obj_id in obj_ids if obj_id in found]
+
+    @classmethod
+    async def get_all(cls, db: AsyncSession, skip: int = 0, limit: Optional[int] = 100) -> List[ModelT]:
+        """分页获取记录（limit 为 None 时不限制条数）"""
+        stmt = (
+            select(cls.model)
+            .options(*cls._load_options())
+            .order_by(*(cls.order_by or (cls.model.id,)))
+            .offset(skip)
+            .limit(limit)
+        )
+        result = await db.execute(stmt)
+        return result.scalars().all()
+
+    @classmethod
+    async def create(cls, db: AsyncSession, data: dict) -> ModelT:
+        """创建记录"""
+        stmt = sa_insert(cls.model).values(**data).returning(cls.model)
+        result = await db.execute(stmt)
+        await db.commit()
+        return result.scalar_one()
+
+    @classmethod
+    async def create_many(cls, db: AsyncSession, rows: List[dict]) -> List[ModelT]:
+        """批量创建记录（单条 INSERT ... RETURNING，一次提交）"""
+        if not rows:
+            return []
+        result = await db.execute(sa_insert(cls.model).returning(cls.model), rows)
+        await db.commit()
+        return result.scalars().all()
+
+    @classmethod
+    async def bulk_copy(cls, db: AsyncSession, rows: List[dict]) -> int:
+        """大批量导入记录，返回写入条数
+
+        达到 COPY_THRESHOLD 条时走 PostgreSQL COPY（asyncpg copy_records_to_table），
+        完全绕过 ORM；条数较少时退回普通的 executemany INSERT。
+        各行键集合不同时按键集合分组 COPY，缺少的列交给数据库 server_default。
+        """
+        if not rows:
+            return 0
+        if len(rows) < COPY_THRESHOLD:
+            await db.execute(sa_insert(cls.model), rows)
+            await db.commit()
+            return len(rows)
+
+        table = cls.model.__table__
+        # COPY 不会执行 Python 侧的列默认值，需要手动补齐；未出现的列交给数据库 server_default
+        defaults = {
+            column.name: column.default.arg
+            for column in table.columns
+            if column.default is not None and column.default.is_scalar
+        }
+        # 按键集合分组分别 COPY：某行缺少的列不能写成显式 NULL，否则会覆盖数据库的 server_default
+        groups = {}
+        for row in rows:
+            groups.setdefault(frozenset(row), []).append(row)
+
+        conn = await db.connection()
+        raw = await conn.get_raw_connection()
+        for group in groups.values():
+            columns = list(group[0]) + [name for name in defaults if name not in group[0]]
+            records = [
+                tuple(row[name] if name in row else defaults[name] for name in columns)
+                for row in group
+            ]
+            await raw.driver_connection.copy_records_to_table(
+                table.name, records=records, columns=columns
+            )
+        await db.commit()
+        return len(rows)
+
+    @classmethod
+    async def update(cls, db: AsyncSession, obj_id: int, update_data: dict) -> Optional[ModelT]:
+        """更新记录"""
+        stmt = (
+            sa_update(cls.model)
+            .where(cls.model.id == obj_id)
+            .values(**update_data)
+            .returning(cls.model)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(stmt)
+        await db.commit()
+        return result.scalar_one_or_none()
+
+    @classmethod
+    async def delete(cls, db: AsyncSession, obj_id: int) -> bool:
+        """删除记录"""
+        stmt = (
+            sa_delete(cls.model)
+            .where(cls.model.id == obj_id)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(stmt)
+        await db.commit()
+        return result.rowcount > 0
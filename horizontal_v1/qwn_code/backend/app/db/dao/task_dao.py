@@ -1,76 +1,92 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import func, or_, update as sa_update
+from app.db.dao.generic_dao import BaseDAO
 from app.models.task import TaskInfo, TaskLog
-from typing import Optional, List
+from typing import Optional, List, Tuple, AsyncIterator
+from datetime import datetime
 
 
-class TaskInfoDAO:
+class TaskInfoDAO(BaseDAO[TaskInfo]):
     """任务信息数据访问对象"""
-    
-    @staticmethod
-    async def get_by_id(db: AsyncSession, task_id: int) -> Optional[TaskInfo]:
-        """根据ID获取任务"""
-        stmt = select(TaskInfo).where(TaskInfo.id == task_id)
-        result = await db.execute(stmt)
-        return result.scalar_one_or_none()
-    
-    @staticmethod
-    async def get_all(db: AsyncSession) -> List[TaskInfo]:
-        """获取所有任务"""
-        stmt = select(TaskInfo)
+
+    model = TaskInfo
+
+    @classmethod
+    async def set_state(cls, db: AsyncSession, task_id: int, enabled: bool, status: str) -> bool:
+        """切换任务状态；已处于目标状态的行不会被改写，返回是否实际更新"""
+        stmt = (
+            sa_update(TaskInfo)
+            .where(
+                TaskInfo.id == task_id,
+                or_(TaskInfo.enabled.is_distinct_from(enabled), TaskInfo.status.is_distinct_from(status))
+            )
+            .values(enabled=enabled, status=status)
+            .execution_options(synchronize_session=False)
+        )
         result = await db.execute(stmt)
-        return result.scalars().all()
-    
-    @staticmethod
-    async def create(db: AsyncSession, task_data: dict) -> TaskInfo:
-        """创建任务"""
-        db_task = TaskInfo(**task_data)
-        db.add(db_task)
         await db.commit()
-        await db.refresh(db_task)
-        return db_task
-    
-    @staticmethod
-    async def update(db: AsyncSession, task_id: int, update_data: dict) -> TaskInfo:
-        """更新任务"""
-        db_task = await TaskInfoDAO.get_by_id(db, task_id)
-        if not db_task:
-            return None
-        
-        for key, value in update_data.items():
-            setattr(db_task, key, value)
-        
-        await db.commit()
-        await db.refresh(db_task)
-        return db_task
-    
-    @staticmethod
-    async def delete(db: AsyncSession, task_id: int) -> bool:
-        """删除任务"""
-        db_task = await TaskInfoDAO.get_by_id(db, task_id)
-        if not db_task:
-            return False
-        
-        await db.delete(db_task)
-        await db.commit()
-        return True
+        return result.rowcount > 0
 
 
-class TaskLogDAO:
+class TaskLogDAO(BaseDAO[TaskLog]):
     """任务日志数据访问对象"""
-    
-    @staticmethod
-    async def get_by_task_id(db: AsyncSession, task_id: int, skip: int = 0, limit: int = 100) -> List[TaskLog]:
-        """根据任务ID获取日志"""
-        stmt = select(TaskLog).where(TaskLog.task_id == task_id).offset(skip).limit(limit).order_by(TaskLog.created_at.desc())
+
+    model = TaskLog
+
+    @classmethod
+    async def get_by_task_id(cls, db: AsyncSession, task_id: int, skip: int = 0, limit: int = 100,
+                             before: Optional[datetime] = None) -> List[TaskLog]:
+        """根据任务ID获取日志（传入 before 时按游标翻页，取早于该时间的日志并忽略 skip）"""
+        stmt = select(TaskLog).where(TaskLog.task_id == task_id)
+        if before is not None:
+            stmt = stmt.where(TaskLog.created_at < before)
+        else:
+            stmt = stmt.offset(skip)
+        stmt = stmt.order_by(TaskLog.created_at.desc()).limit(limit)
         result = await db.execute(stmt)
         return result.scalars().all()
-    
-    @staticmethod
-    async def create(db: AsyncSession, log_data: dict) -> TaskLog:
-        """创建任务日志"""
-        db_log = TaskLog(**log_data)
-        db.add(db_log)
-        await db.commit()
-        await db.refresh(db_log)
-        return db_log
\ No newline at end of file
+
+    @classmethod
+    async def get_paginated_logs(cls, db: AsyncSession, task_id: Optional[int], page: int = 1,
+                                 size: int = 20) -> Tuple[List[TaskLog], int]:
+        """分页获取任务日志（task_id 为空时返回全部任务的日志）"""
+        stmt = select(TaskLog)
+        count_stmt = select(func.count()).select_from(TaskLog)
+        if task_id is not None:
+            stmt = stmt.where(TaskLog.task_id == task_id)
+            count_stmt = count_stmt.where(TaskLog.task_id == task_id)
+
+        total = (await db.execute(count_stmt)).scalar_one()
+        stmt = stmt.order_by(TaskLog.created_at.desc()).offset((page - 1) * size).limit(size)
+        # 使用服务端游标分批拉取，避免驱动一次性缓冲整页数据
+        result = await db.stream_scalars(stmt.execution_options(yield_per=200))
+        logs = [log async for log in result]
+        return logs, total
+
+    @classmethod
+    async def get_paginated_log_rows(cls, db: AsyncSession, task_id: Optional[int], page: int = 1,
+                                     size: int = 20) -> Tuple[List[Tuple], int]:
+        """分页获取任务日志的原始列元组 (id, task_id, status, message, created_at)，不构造 ORM 对象"""
+        stmt = select(TaskLog.id, TaskLog.task_id, TaskLog.status, TaskLog.message, TaskLog.created_at)
+        count_stmt = select(func.count()).select_from(TaskLog)
+        if task_id is not None:
+            stmt = stmt.where(TaskLog.task_id == task_id)
+            count_stmt = count_stmt.where(TaskLog.task_id == task_id)
+
+        total = (await db.execute(count_stmt)).scalar_one()
+        stmt = stmt.order_by(TaskLog.created_at.desc()).offset((page - 1) * size).limit(size)
+        rows = (await db.execute(stmt)).all()
+        return rows, total
+
+    @classmethod
+    async def stream_logs(cls, db: AsyncSession, task_id: Optional[int], page: int = 1,
+                          size: int = 20) -> AsyncIterator[TaskLog]:
+        """以服务端游标流式获取任务日志"""
+        stmt = select(TaskLog)
+        if task_id is not None:
+            stmt = stmt.where(TaskLog.task_id == task_id)
+        stmt = stmt.order_by(TaskLog.created_at.desc()).offset((page - 1) * size).limit(size)
+        result = await db.stream_scalars(stmt.execution_options(yield_per=200))
+        async for log in result:
+            yield log
@@ -1,8 +1,83 @@
+import asyncio
+import orjson
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import insert as sa_insert, update as sa_update, delete as sa_delete
 from sqlalchemy.future import select
+from sqlalchemy.sql import lambda_stmt
 from app.models.user import User
-from app.services.auth import get_password_hash
-from typing import Optional
+from app.db.redis import redis_client
+from app.services.auth import get_password_hash_async, invalidate_user_cache
+from typing import Optional, List
+
+# 用户缓存有效期（秒）
+USER_CACHE_TTL = 60
+# 缓存中只保存认证链路用到的字段
+_USER_CACHE_FIELDS = ("id", "phone", "email", "full_name", "is_active", "is_superuser", "hashed_password")
+
+
+def _user_key(user_id: int) -> str:
+    return f"user:id:{user_id}"
+
+
+async def _cache_get_user(user_id) -> Optional[User]:
+    """从缓存读取用户，未命中或 Redis 不可用时返回 None"""
+    try:
+        raw = await redis_client.get(_user_key(user_id))
+    except RedisError:
+        return None
+    return User(**orjson.loads(raw)) if raw else None
+
+
+def _queue_user_cache(pipe, user: User) -> None:
+    """在 pipeline 中排入用户缓存及手机号/邮箱到用户ID的索引"""
+    payload = orjson.dumps({field: getattr(user, field) for field in _USER_CACHE_FIELDS})
+    pipe.set(_user_key(user.id), payload, ex=USER_CACHE_TTL)
+    if user.phone:
+        pipe.set(f"user:phone:{user.phone}", user.id, ex=USER_CACHE_TTL)
+    if user.email:
+        pipe.set(f"user:email:{user.email}", user.id, ex=USER_CACHE_TTL)
+
+
+async def _cache_set_users(users: List[User]) -> None:
+    """批量写入用户缓存，一次往返完成"""
+    if not users:
+        return
+    try:
+        pipe = redis_client.pipeline(transaction=False)
+        for user in users:
+            _queue_user_cache(pipe, user)
+        await pipe.execute()
+    except RedisError:
+        pass
+
+
+async def _cache_set_user(user: User) -> None:
+    """写入单个用户缓存"""
+    await _cache_set_users([user])
+
+
+async def _cache_delete_user(user_id: int) -> None:
+    """失效用户缓存；手机号/邮箱索引命中后会校验字段，无需一并删除"""
+    try:
+        await redis_client.delete(_user_key(user_id))
+    except RedisError:
+        pass
+
+
+async def _cache_get_user_by(field: str, value: str) -> Optional[User]:
+    """通过手机号/邮箱索引读取缓存用户"""
+    try:
+        user_id = await redis_client.get(f"user:{field}:{value}")
+    except RedisError:
+        return None
+    if not user_id:
+        return None
+    user = await _cache_get_user(user_id)
+    # 索引可能指向已改过手机号/邮箱的用户，字段不一致时按未命中处理
+    if user is None or getattr(user, field) != value:
+        return None
+    return user
 
 
 class UserDao:
@@ -10,31 +85,71 @@ class UserDao:
     
     @staticmethod
     async def get_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
-        """根据ID获取用户"""
-        stmt = select(User).where(User.id == user_id)
-        result = await db.execute(stmt)
-        return result.scalar_one_or_none()
+        """根据ID获取用户（优先读缓存）"""
+        user = await _cache_get_user(user_id)
+        if user is not None:
+            return user
+        user = await db.get(User, user_id)
+        if user is not None:
+            await _cache_set_user(user)
+        return user
+    
+    @staticmethod
+    async def get_many_by_ids(db: AsyncSession, user_ids: List[int]) -> List[User]:
+        """批量根据ID获取用户：一次 MGET 读缓存，未命中的用一条 IN 查询补齐并回填缓存"""
+        user_ids = list(dict.fromkeys(user_ids))
+        if not user_ids:
+            return []
+        try:
+            raws = await redis_client.mget([_user_key(user_id) for user_id in user_ids])
+        except RedisError:
+            raws = [None] * len(user_ids)
+        found = {
+            user_id: User(**orjson.loads(raw))
+            for user_id, raw in zip(user_ids, raws) if raw
+        }
+        missing = [user_id for user_id in user_ids if user_id not in found]
+        if missing:
+            result = await db.execute(select(User).where(User.id.in_(missing)))
+            users = result.scalars().all()
+            await _cache_set_users(users)
+            found.update((user.id, user) for user in users)
+        return [found[user_id] for user_id in user_ids if user_id in found]
     
     @staticmethod
     async def get_by_phone(db: AsyncSession, phone: str) -> Optional[User]:
-        """根据手机号获取用户"""
-        stmt = select(User).where(User.phone == phone)
+        """根据手机号获取用户（优先读缓存）"""
+        user = await _cache_get_user_by("phone", phone)
+        if user is not None:
+            return user
+        # lambda_stmt 以 lambda 代码位置为缓存键，跳过语句构造与编译
+        stmt = lambda_stmt(lambda: select(User).where(User.phone == phone))
         result = await db.execute(stmt)
-        return result.scalar_one_or_none()
+        user = result.scalar_one_or_none()
+        if user is not None:
+            await _cache_set_user(user)
+        return user
     
     @staticmethod
     async def get_by_email(db: AsyncSession, email: str) -> Optional[User]:
-        """根据邮箱获取用户"""
-        stmt = select(User).where(User.email == email)
+        """根据邮箱获取用户（优先读缓存）"""
+        user = await _cache_get_user_by("email", email)
+        if user is not None:
+            return user
+        # lambda_stmt 以 lambda 代码位置为缓存键，跳过语句构造与编译
+        stmt = lambda_stmt(lambda: select(User).where(User.email == email))
         result = await db.execute(stmt)
-        return result.scalar_one_or_none()
+        user = result.scalar_one_or_none()
+        if user is not None:
+            await _cache_set_user(user)
+        return user
     
     @staticmethod
     async def create_user(db: AsyncSession, user_data: dict) -> User:
         """创建用户"""
-        # 对密码进行哈希处理
+        # 对密码进行哈希处理（只存 hashed_password，校验统一走 auth.verify_password 的常量时间比较）
         if 'password' in user_data:
-            user_data['hashed_password'] = get_password_hash(user_data.pop('password'))
+            user_data['hashed_password'] = await get_password_hash_async(user_data.pop('password'))
         
         db_user = User(**user_data)
         db.add(db_user)
@@ -43,30 +158,47 @@ class UserDao:
         return db_user
     
     @staticmethod
-    async def update_user(db: AsyncSession, user_id: int, update_data: dict) -> User:
-        """更新用户"""
-        db_user = await UserDao.get_by_id(db, user_id)
-        if not db_user:
-            return None
+    async def create_users_bulk(db: AsyncSession, user_data_list: List[dict]) -> List[User]:
+        """批量创建用户（单条 INSERT ... RETURNING，一次提交）"""
+        if not user_data_list:
+            return []
+        rows = [dict(user_data) for user_data in user_data_list]
+        # 对密码进行哈希处理，多个哈希在线程池中并行计算
+        pending = [row for row in rows if 'password' in row]
+        hashes = await asyncio.gather(*(get_password_hash_async(row.pop('password')) for row in pending))
+        for row, hashed in zip(pending, hashes):
+            row['hashed_password'] = hashed
         
+        result = await db.execute(sa_insert(User).returning(User), rows)
+        await db.commit()
+        return result.scalars().all()
+    
+    @staticmethod
+    async def update_user(db: AsyncSession, user_id: int, update_data: dict) -> Optional[User]:
+        """更新用户"""
         # 如果有密码更新，需要哈希处理
         if 'password' in update_data:
-            update_data['hashed_password'] = get_password_hash(update_data.pop('password'))
-        
-        for key, value in update_data.items():
-            setattr(db_user, key, value)
+            update_data['hashed_password'] = await get_password_hash_async(update_data.pop('password'))
         
+        stmt = (
+            sa_update(User)
+            .where(User.id == user_id)
+            .values(**update_data)
+            .returning(User)
+            .execution_options(synchronize_session=False)
+        )
+        result = await db.execute(stmt)
         await db.commit()
-        await db.refresh(db_user)
-        return db_user
+        await _cache_delete_user(user_id)
+        await invalidate_user_cache(user_id)
+        return result.scalar_one_or_none()
     
     @staticmethod
     async def delete_user(db: AsyncSession, user_id: int) -> bool:
         """删除用户"""
-        db_user = await UserDao.get_by_id(db, user_id)
-        if not db_user:
-            return False
-        
-        await db.delete(db_user)
+        stmt = sa_delete(User).where(User.id == user_id).returning(User.id)
+        result = await db.execute(stmt)
         await db.commit()
-        return True
\ No newline at end of file
+        await _cache_delete_user(user_id)
+        await invalidate_user_cache(user_id)
+        return result.scalar_one_or_none() is not None
\ No newline at end of file
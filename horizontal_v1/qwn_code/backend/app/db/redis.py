@@ -1,4 +1,6 @@
 import redis.asyncio as redis
+from redis.asyncio.retry import Retry
+from redis.backoff import ExponentialBackoff
 from app.core.config.settings import settings
 import logging
 
@@ -7,16 +9,19 @@ import logging
 redis_pool = redis.ConnectionPool.from_url(
     settings.REDIS_URL,
     decode_responses=True,  # 自动解码响应
-    max_connections=20,     # 最大连接数
-    retry_on_timeout=True   # 超时时重试
+    max_connections=settings.REDIS_POOL_SIZE,  # 最大连接数
+    retry=Retry(ExponentialBackoff(cap=0.5, base=0.01), retries=3),  # 网络抖动时指数退避重试
+    retry_on_timeout=True,  # 超时时重试
+    health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL,  # 提前发现失效连接，避免在请求路径上重连
+    socket_keepalive=True,  # 开启 TCP keepalive
 )
 
 # 创建Redis客户端
 redis_client = redis.Redis(connection_pool=redis_pool)
 
 
-async def get_redis_client():
-    """获取Redis客户端"""
+def get_redis_client() -> redis.Redis:
+    """获取Redis客户端（普通函数，作为依赖注入时无需额外调度协程）"""
     return redis_client
 
 
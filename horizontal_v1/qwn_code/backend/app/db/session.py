@@ -1,36 +1,49 @@
-from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.pool import NullPool
 from app.core.config.settings import settings
 import logging
 
 
+if settings.DB_USE_PGBOUNCER:
+    # PgBouncer 事务模式下由其复用连接，应用侧不再持有连接池；
+    # 同一会话可能落到不同后端连接，需关闭 asyncpg 的预编译语句缓存
+    _pool_options = dict(
+        poolclass=NullPool,
+        connect_args={"statement_cache_size": 0, "prepared_statement_cache_size": 0},
+    )
+else:
+    _pool_options = dict(
+        pool_size=settings.DB_POOL_SIZE,          # 常驻连接数
+        max_overflow=settings.DB_MAX_OVERFLOW,    # 高峰期溢出连接数
+        pool_pre_ping=True,                       # 检测断开的连接
+        pool_recycle=settings.DB_POOL_RECYCLE,    # 重新连接间隔
+        pool_timeout=settings.DB_POOL_TIMEOUT,    # 连接池耗尽时的等待上限，超时快速失败
+        pool_use_lifo=True,                       # 优先复用最近归还的连接，保持热连接
+    )
+
 # 创建异步引擎
 engine = create_async_engine(
     settings.DATABASE_URL,
     echo=settings.DATABASE_ECHO,
-    pool_pre_ping=True,  # 检测断开的连接
-    pool_recycle=300,    # 重新连接间隔
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,  # 扩大编译缓存，避免热点语句被挤出后重新编译
+    **_pool_options,
 )
 
 # 创建异步会话工厂
-AsyncSessionLocal = sessionmaker(
+AsyncSessionLocal = async_sessionmaker(
     engine,
-    class_=AsyncSession,
     expire_on_commit=False
 )
 
 
-async def get_db_session():
-    """获取数据库会话的依赖项"""
-    async with AsyncSessionLocal() as session:
-        try:
-            yield session
-        finally:
-            await session.close()
+def get_db_session() -> AsyncSession:
+    """获取数据库会话：async with get_db_session() as db，退出时会话自动关闭
+
+    AsyncSession 本身就是异步上下文管理器，直接返回即可，无需再包一层生成器
+    """
+    return AsyncSessionLocal()
 
 
-# 日志配置
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 
@@ -1,7 +1,6 @@
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy import Column, Integer, DateTime, func
-from datetime import datetime
 
 
 class Base(DeclarativeBase):
@@ -11,5 +10,6 @@ class Base(DeclarativeBase):
 
 class TimestampMixin:
     """时间戳混入类"""
-    created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
\ No newline at end of file
+    # 时间戳由数据库生成，插入/更新时无需在 Python 侧逐行求值
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
\ No newline at end of file
@@ -1,6 +1,5 @@
 from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey
-from sqlalchemy.orm import relationship
-from datetime import datetime
+from sqlalchemy.orm import relationship, backref
 from .base import Base, TimestampMixin
 
 
@@ -8,7 +7,7 @@ class SysParam(Base, TimestampMixin):
     """系统参数表"""
     __tablename__ = "sys_param"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     key_name = Column(String(100), unique=True, nullable=False, comment="参数键名")
     name = Column(String(100), nullable=False, comment="参数名称")
     value = Column(Text, comment="参数值")
@@ -20,7 +19,7 @@ class Menu(Base, TimestampMixin):
     """菜单表"""
     __tablename__ = "sys_menu"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False, comment="菜单名称")
     parent_id = Column(Integer, ForeignKey("sys_menu.id"), comment="父级菜单ID")
     path = Column(String(200), nullable=False, comment="路由路径")
@@ -32,14 +31,16 @@ class Menu(Base, TimestampMixin):
     description = Column(String(500), comment="菜单描述")
 
     # 自关联关系
-    parent = relationship("Menu", remote_side=[id], backref="children")
+    parent = relationship("Menu", remote_side=[id], lazy="raise", backref=backref("children", order_by=[sort, id]))
+    # 关系：菜单与角色（Role.menus 的反向端）
+    roles = relationship("Role", secondary="sys_role_menu", back_populates="menus")
 
 
 class Department(Base, TimestampMixin):
     """部门表"""
     __tablename__ = "sys_department"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False, comment="部门名称")
     parent_id = Column(Integer, ForeignKey("sys_department.id"), comment="父级部门ID")
     leader_id = Column(Integer, comment="负责人ID")
@@ -48,14 +49,14 @@ class Department(Base, TimestampMixin):
     description = Column(String(500), comment="部门描述")
 
     # 自关联关系
-    parent = relationship("Department", remote_side=[id], backref="children")
+    parent = relationship("Department", remote_side=[id], lazy="raise", backref="children")
 
 
 class Role(Base, TimestampMixin):
     """角色表"""
     __tablename__ = "sys_role"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(100), nullable=False, comment="角色名称")
     code = Column(String(100), unique=True, nullable=False, comment="角色编码")
     description = Column(String(500), comment="角色描述")
@@ -68,7 +69,7 @@ class RoleMenu(Base):
     """角色菜单关联表"""
     __tablename__ = "sys_role_menu"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     role_id = Column(Integer, ForeignKey("sys_role.id"), nullable=False)
     menu_id = Column(Integer, ForeignKey("sys_menu.id"), nullable=False)
 
@@ -77,7 +78,7 @@ class UserDepartment(Base):
     """用户部门关联表"""
     __tablename__ = "sys_user_department"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     department_id = Column(Integer, ForeignKey("sys_department.id"), nullable=False)
 
@@ -86,6 +87,6 @@ class UserRole(Base):
     """用户角色关联表"""
     __tablename__ = "sys_user_role"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     role_id = Column(Integer, ForeignKey("sys_role.id"), nullable=False)
\ No newline at end of file
@@ -1,6 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Float, ForeignKey, Index
 from sqlalchemy.orm import relationship
-from datetime import datetime
 from app.models.base import Base, TimestampMixin
 
 
@@ -8,18 +7,21 @@ class Vendor(Base, TimestampMixin):
     """供应商表"""
     __tablename__ = "rk_vendor"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(200), nullable=False, comment="供应商名称")
     code = Column(String(100), unique=True, nullable=False, comment="供应商编码")
     folder_id = Column(String(200), comment="SharePoint文件夹ID")
     description = Column(Text, comment="供应商描述")
 
+    # 联系人集合随父对象批量 IN 加载，避免异步下逐行懒加载
+    contacts = relationship("VendorContact", order_by="VendorContact.id", back_populates="vendor", lazy="selectin")
+
 
 class VendorContact(Base, TimestampMixin):
     """供应商联系人表"""
     __tablename__ = "rk_vendor_contact"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     vendor_id = Column(Integer, ForeignKey("rk_vendor.id"), nullable=False, comment="供应商ID")
     name = Column(String(100), nullable=False, comment="联系人姓名")
     email = Column(String(100), comment="联系人邮箱")
@@ -34,19 +36,21 @@ class Customer(Base, TimestampMixin):
     """客户表"""
     __tablename__ = "rk_customer"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(200), nullable=False, comment="客户名称")
     code = Column(String(100), unique=True, nullable=False, comment="客户编码")
     address = Column(String(500), comment="客户地址")
     postcode = Column(String(20), comment="邮政编码")
     description = Column(Text, comment="客户描述")
 
+    contacts = relationship("CustomerContact", order_by="CustomerContact.id", back_populates="customer", lazy="selectin")
+
 
 class CustomerContact(Base, TimestampMixin):
     """客户联系人表"""
     __tablename__ = "rk_customer_contact"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     customer_id = Column(Integer, ForeignKey("rk_customer.id"), nullable=False, comment="客户ID")
     name = Column(String(100), nullable=False, comment="联系人姓名")
     email = Column(String(100), comment="联系人邮箱")
@@ -61,7 +65,7 @@ class Supply(Base, TimestampMixin):
     """简历表"""
     __tablename__ = "rk_supply"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     vendor_id = Column(Integer, ForeignKey("rk_vendor.id"), nullable=False, comment="供应商ID")
     name = Column(String(200), comment="简历名称")
     path = Column(String(500), comment="文件路径")
@@ -73,7 +77,7 @@ class Supply(Base, TimestampMixin):
     acdtc = Column(String(200), comment="ACDTC字段")
     contracted_member = Column(String(200), comment="签约成员")
     task_status = Column(String(50), default="0000000000000010", comment="任务状态")
-    price_update_task_date = Column(DateTime, comment="价格更新任务日期")
+    price_update_task_date = Column(DateTime(timezone=True), comment="价格更新任务日期")
     price_update = Column(Float, comment="更新价格")
     price_original = Column(Float, comment="原始价格")
     active = Column(Boolean, default=True, comment="是否激活")
@@ -95,7 +99,7 @@ class Demand(Base, TimestampMixin):
     """需求表"""
     __tablename__ = "rk_demand"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     customer_id = Column(Integer, ForeignKey("rk_customer.id"), nullable=False, comment="客户ID")
     name = Column(String(200), comment="需求名称")
     remark = Column(Text, comment="需求备注")
@@ -117,7 +121,7 @@ class MatchResult(Base, TimestampMixin):
     """匹配结果表"""
     __tablename__ = "rk_match_result"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     demand_id = Column(Integer, ForeignKey("rk_demand.id"), nullable=False, comment="需求ID")
     supply_id = Column(Integer, ForeignKey("rk_supply.id"), nullable=False, comment="简历ID")
     score = Column(Float, comment="匹配分数")
@@ -125,23 +129,29 @@ class MatchResult(Base, TimestampMixin):
     status = Column(String(50), default="PENDING", comment="匹配状态")
     matched_by = Column(Integer, comment="匹配操作人ID")
 
-    demand = relationship("Demand")
-    supply = relationship("Supply")
+    # 列表场景按 IN 批量加载关联的需求/简历，避免逐条懒加载
+    demand = relationship("Demand", lazy="selectin")
+    supply = relationship("Supply", lazy="selectin")
 
 
 class Notice(Base, TimestampMixin):
     """通知表"""
     __tablename__ = "rk_notice"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     title = Column(String(200), comment="通知标题")
     content = Column(Text, comment="通知内容")
     type = Column(String(50), comment="通知类型")
     recipient_id = Column(Integer, comment="接收者ID")
     is_read = Column(Boolean, default=False, comment="是否已读")
-    read_time = Column(DateTime, comment="阅读时间")
+    read_time = Column(DateTime(timezone=True), comment="阅读时间")
 
 
-# 添加关系定义
-Vendor.contacts = relationship("VendorContact", order_by=VendorContact.id, back_populates="vendor")
-Customer.contacts = relationship("CustomerContact", order_by=CustomerContact.id, back_populates="customer")
\ No newline at end of file
+# 列表/关联查询的常用过滤条件索引（前缀列同时覆盖按外键单独查询的场景）
+Index("ix_supply_vendor_active_status", Supply.vendor_id, Supply.active, Supply.analysis_status)
+Index("ix_demand_customer_active_status", Demand.customer_id, Demand.active, Demand.analysis_status)
+Index("ix_match_demand_status", MatchResult.demand_id, MatchResult.status)
+Index("ix_match_supply_status", MatchResult.supply_id, MatchResult.status)
+Index("ix_notice_recipient_is_read", Notice.recipient_id, Notice.is_read)
+Index("ix_vendor_contact_vendor_id", VendorContact.vendor_id)
+Index("ix_customer_contact_customer_id", CustomerContact.customer_id)
\ No newline at end of file
@@ -1,6 +1,5 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index
 from sqlalchemy.orm import relationship
-from datetime import datetime
 from app.models.base import Base, TimestampMixin
 
 
@@ -8,7 +7,7 @@ class TaskInfo(Base, TimestampMixin):
     """任务信息表"""
     __tablename__ = "task_info"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     name = Column(String(200), nullable=False, comment="任务名称")
     type = Column(Integer, nullable=False, comment="任务类型")
     cron_expression = Column(String(100), nullable=False, comment="CRON表达式")
@@ -16,15 +15,17 @@ class TaskInfo(Base, TimestampMixin):
     description = Column(Text, comment="任务描述")
     enabled = Column(Boolean, default=True, comment="是否启用")
     status = Column(String(50), default="STOPPED", comment="任务状态")
-    last_run_time = Column(DateTime, comment="最后运行时间")
-    next_run_time = Column(DateTime, comment="下次运行时间")
+    last_run_time = Column(DateTime(timezone=True), comment="最后运行时间")
+    next_run_time = Column(DateTime(timezone=True), comment="下次运行时间")
+
+    logs = relationship("TaskLog", order_by="TaskLog.id", back_populates="task")
 
 
 class TaskLog(Base, TimestampMixin):
     """任务日志表"""
     __tablename__ = "task_log"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     task_id = Column(Integer, ForeignKey("task_info.id"), nullable=False, comment="任务ID")
     status = Column(String(50), nullable=False, comment="执行状态")
     message = Column(Text, comment="执行消息")
@@ -33,5 +34,5 @@ class TaskLog(Base, TimestampMixin):
     task = relationship("TaskInfo", back_populates="logs")
 
 
-# 添加反向关系
-TaskInfo.logs = relationship("TaskLog", order_by=TaskLog.id, back_populates="task")
\ No newline at end of file
+# 按任务分页查询日志（task_id 过滤 + created_at 倒序）可直接走索引，无需额外排序
+Index("ix_task_log_task_id_created_at", TaskLog.task_id, TaskLog.created_at.desc())
\ No newline at end of file
@@ -1,5 +1,4 @@
 from sqlalchemy import Column, Integer, String, DateTime, Boolean
-from datetime import datetime
 from app.models.base import Base, TimestampMixin
 
 
@@ -7,7 +6,7 @@ class User(Base, TimestampMixin):
     """用户模型"""
     __tablename__ = "users"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     username = Column(String(50), unique=True, index=True)
     email = Column(String(100), unique=True, index=True)
     phone = Column(String(20), unique=True, index=True)
@@ -1,9 +1,14 @@
 from app.schemas.response import BaseSchema
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
-class ChatMessageRequest(BaseModel):
+class ChatBaseModel(BaseModel):
+    """聊天模型基类：保持 snake_case 字段名，首次使用时再构建校验器"""
+    model_config = ConfigDict(defer_build=True)
+
+
+class ChatMessageRequest(ChatBaseModel):
     """聊天消息请求"""
     query: str
     conversation_id: Optional[str] = None
@@ -12,7 +17,7 @@ class ChatMessageRequest(BaseModel):
     response_mode: str = "blocking"  # blocking or streaming
 
 
-class ChatMessageResponse(BaseModel):
+class ChatMessageResponse(ChatBaseModel):
     """聊天消息响应"""
     code: int = 1000
     message: str = "success"
@@ -20,14 +25,14 @@ class ChatMessageResponse(BaseModel):
     request_id: Optional[str] = None
 
 
-class ChatHistoryRequest(BaseModel):
+class ChatHistoryRequest(ChatBaseModel):
     """聊天历史请求"""
     conversation_id: str
     limit: int = 20
     offset: int = 0
 
 
-class ChatHistoryItem(BaseModel):
+class ChatHistoryItem(ChatBaseModel):
     """聊天历史项"""
     id: str
     query: str
@@ -35,7 +40,7 @@ class ChatHistoryItem(BaseModel):
     created_at: str
 
 
-class ChatHistoryResponse(BaseModel):
+class ChatHistoryResponse(ChatBaseModel):
     """聊天历史响应"""
     code: int = 1000
     message: str = "success"
@@ -43,13 +48,13 @@ class ChatHistoryResponse(BaseModel):
     request_id: Optional[str] = None
 
 
-class ConversationListRequest(BaseModel):
+class ConversationListRequest(ChatBaseModel):
     """会话列表请求"""
     limit: int = 20
     offset: int = 0
 
 
-class ConversationItem(BaseModel):
+class ConversationItem(ChatBaseModel):
     """会话项"""
     id: str
     name: str
@@ -57,7 +62,7 @@ class ConversationItem(BaseModel):
     updated_at: str
 
 
-class ConversationListResponse(BaseModel):
+class ConversationListResponse(ChatBaseModel):
     """会话列表响应"""
     code: int = 1000
     message: str = "success"
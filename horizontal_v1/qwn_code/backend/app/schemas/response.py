@@ -1,14 +1,18 @@
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, Field
 from pydantic.alias_generators import to_camel
 from typing import Optional, Generic, TypeVar, List, Any, Dict
 from enum import Enum
-from datetime import datetime
+from datetime import datetime, timezone
 import uuid
 
 
 T = TypeVar('T')
 
 
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class ResponseCode(Enum):
     """响应码枚举"""
     SUCCESS = 1000
@@ -25,12 +29,7 @@ class BaseResponse(BaseModel):
     code: int
     message: str
     request_id: Optional[str] = None
-    timestamp: datetime = datetime.now()
-
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    timestamp: datetime = Field(default_factory=_utcnow)
 
 
 class SuccessResponse(BaseModel, Generic[T]):
@@ -39,12 +38,7 @@ class SuccessResponse(BaseModel, Generic[T]):
     message: str = "success"
     result: Optional[T] = None
     request_id: Optional[str] = None
-    timestamp: datetime = datetime.now()
-
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    timestamp: datetime = Field(default_factory=_utcnow)
 
 
 class ErrorResponse(BaseModel):
@@ -53,12 +47,7 @@ class ErrorResponse(BaseModel):
     message: str
     result: Optional[Dict[str, Any]] = None
     request_id: Optional[str] = None
-    timestamp: datetime = datetime.now()
-
-    class Config:
-        json_encoders = {
-            datetime: lambda v: v.isoformat()
-        }
+    timestamp: datetime = Field(default_factory=_utcnow)
 
 
 # 为了兼容 snake_case 和 camelCase 输入，我们定义一个基类
@@ -70,5 +59,9 @@ class BaseSchema(BaseModel):
         # 允许任意类型
         arbitrary_types_allowed=True,
         # 使用驼峰命名作为别名
-        alias_generator=to_camel
+        alias_generator=to_camel,
+        # 支持直接从 ORM 对象校验
+        from_attributes=True,
+        # 首次使用时再构建校验器，缩短导入/启动时间
+        defer_build=True
     )
\ No newline at end of file
@@ -1,60 +1,146 @@
-from datetime import datetime, timedelta
+import asyncio
+import hashlib
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
 from typing import Optional
 import jwt
-from passlib.context import CryptContext
+from cachetools import TTLCache
+import bcrypt
 from app.core.config.settings import settings
 from app.schemas.auth import LoginRequest, RefreshTokenRequest
 from app.db.session import get_db_session
+from app.db.redis import redis_client
+from redis.exceptions import RedisError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
-# 密码加密上下文
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# 只使用 bcrypt 一种方案，直接调用 bcrypt 库，省去 passlib 每次调用时的方案识别与配置解析
+_BCRYPT_ROUNDS = settings.BCRYPT_ROUNDS
+# bcrypt 只使用密码的前 72 字节，显式截断以保持与原 passlib 行为一致
+_BCRYPT_MAX_BYTES = 72
+
+# bcrypt 专用线程池：哈希/校验是 CPU 密集操作，放到线程中执行以免阻塞事件循环；
+# 信号量限制同时提交的运算数，超出部分在事件循环侧排队，不在线程池里堆积
+_BCRYPT_CONCURRENCY = settings.BCRYPT_CONCURRENCY or os.cpu_count() or 1
+_BCRYPT_POOL = ThreadPoolExecutor(max_workers=_BCRYPT_CONCURRENCY, thread_name_prefix="bcrypt")
+_BCRYPT_SEM = asyncio.Semaphore(_BCRYPT_CONCURRENCY)
+
+# 用户不存在时用于比对的哈希，使登录失败耗时与密码错误一致，避免通过响应时间枚举用户
+_DUMMY_HASH = bcrypt.hashpw(b"invalid", bcrypt.gensalt(rounds=_BCRYPT_ROUNDS)).decode()
+# 登录账号按原样存于 users.phone（String(20)，可为 admin 之类的账号名或带分隔符的号码），
+# 只拦截不可能存在的值（空串或超出列宽），其余照常查库
+_PHONE_MAX_LEN = 20
+
+# JWT 签名参数与有效期（秒），导入时确定
+_JWT_KEY = settings.SECRET_KEY
+_JWT_ALGORITHM = settings.ALGORITHM
+_JWT_ALGORITHMS = [settings.ALGORITHM]
+_ACCESS_TOKEN_TTL = settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+_REFRESH_TOKEN_TTL = settings.REFRESH_TOKEN_EXPIRE_DAYS * 86400
+
+# 已验证令牌的载荷缓存，键为令牌摘要（不长期持有完整令牌）
+_token_cache: TTLCache = TTLCache(maxsize=4096, ttl=30)
+# 校验失败令牌的短时负缓存，重复提交的无效令牌不再重复做签名校验；容量单独限定，无效令牌无法挤占正缓存
+_bad_token_cache: TTLCache = TTLCache(maxsize=1024, ttl=5)
+# 令牌对应用户信息的进程内缓存，键为用户ID，值为 (用户版本号, 用户信息)；用户变更时需调用 invalidate_user_cache
+_user_cache: TTLCache = TTLCache(maxsize=4096, ttl=15)
+# 用户版本号保存在 Redis 中，所有 worker 共享：变更用户时递增，版本号不一致的进程内缓存视为失效。
+# 版本号的有效期远大于进程内缓存的有效期，过期后不会与仍在缓存中的旧版本号相等
+_USER_VERSION_TTL = 3600
+# Redis 不可用时的版本号占位，与任何缓存条目都不相等
+_NO_VERSION = object()
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """验证密码"""
-    return pwd_context.verify(plain_password, hashed_password)
+    # bcrypt.checkpw 内部为常量时间比较，不要改成对哈希串直接 ==
+    return bcrypt.checkpw(plain_password.encode("utf-8")[:_BCRYPT_MAX_BYTES], hashed_password.encode("utf-8"))
 
 
 def get_password_hash(password: str) -> str:
     """获取密码哈希"""
-    return pwd_context.hash(password)
+    salt = bcrypt.gensalt(rounds=_BCRYPT_ROUNDS)
+    return bcrypt.hashpw(password.encode("utf-8")[:_BCRYPT_MAX_BYTES], salt).decode("utf-8")
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """在 bcrypt 线程池中验证密码"""
+    async with _BCRYPT_SEM:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_BCRYPT_POOL, verify_password, plain_password, hashed_password)
+
+
+async def get_password_hash_async(password: str) -> str:
+    """在 bcrypt 线程池中计算密码哈希"""
+    async with _BCRYPT_SEM:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_BCRYPT_POOL, get_password_hash, password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """创建访问令牌"""
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-
-    to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+    expires_in = int(expires_delta.total_seconds()) if expires_delta else _ACCESS_TOKEN_TTL
+    # PyJWT 接受整数时间戳形式的 exp
+    to_encode = {**data, "exp": int(time.time()) + expires_in, "type": "access"}
+    return jwt.encode(to_encode, _JWT_KEY, algorithm=_JWT_ALGORITHM)
 
 
 def create_refresh_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """创建刷新令牌"""
-    to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    expires_in = int(expires_delta.total_seconds()) if expires_delta else _REFRESH_TOKEN_TTL
+    to_encode = {**data, "exp": int(time.time()) + expires_in, "type": "refresh"}
+    return jwt.encode(to_encode, _JWT_KEY, algorithm=_JWT_ALGORITHM)
+
 
-    to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
-    return encoded_jwt
+def _token_key(token: str) -> bytes:
+    return hashlib.blake2b(token.encode(), digest_size=16).digest()
 
 
 def verify_token(token: str) -> Optional[dict]:
-    """验证令牌"""
+    """验证令牌（短时缓存验证结果，命中时仍校验过期时间）"""
+    key = _token_key(token)
+    payload = _token_cache.get(key)
+    if payload is not None:
+        if payload.get("exp", 0) > time.time():
+            return payload
+        _token_cache.pop(key, None)
+        return None
+
+    if key in _bad_token_cache:
+        return None
+
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        return payload
+        payload = jwt.decode(token, _JWT_KEY, algorithms=_JWT_ALGORITHMS)
     except jwt.PyJWTError:
+        _bad_token_cache[key] = True
         return None
+    _token_cache[key] = payload
+    return payload
+
+
+def invalidate_token(token: str) -> None:
+    """使令牌的缓存验证结果失效（如注销时调用）"""
+    _token_cache.pop(_token_key(token), None)
+
+
+def _user_version_key(user_id: int) -> str:
+    return f"user:version:{user_id}"
+
+
+async def invalidate_user_cache(user_id: int) -> None:
+    """使用户信息缓存失效（更新/删除用户后调用）：清除本进程缓存，并递增 Redis 中的版本号通知其他 worker"""
+    _user_cache.pop(user_id, None)
+    key = _user_version_key(user_id)
+    try:
+        async with redis_client.pipeline(transaction=False) as pipe:
+            pipe.incr(key)
+            pipe.expire(key, _USER_VERSION_TTL)
+            await pipe.execute()
+    except RedisError:
+        # Redis 不可用时其他 worker 的进程内缓存最多在 TTL（15 秒）内沿用旧数据
+        pass
 
 
 class AuthService:
@@ -64,13 +150,16 @@ class AuthService:
     async def authenticate_user(phone: str, password: str) -> Optional[dict]:
         """验证用户凭据"""
         from app.db.dao.user_dao import UserDao
-        async for db in get_db_session():
+        if not phone or len(phone) > _PHONE_MAX_LEN:
+            return None
+        async with get_db_session() as db:
             user = await UserDao.get_by_phone(db, phone)
             if not user:
-                # 为了安全，即使用户不存在也返回False
+                # 为了安全，即使用户不存在也照常做一次哈希比对再返回
+                await verify_password_async(password, _DUMMY_HASH)
                 return None
 
-            if not verify_password(password, user.hashed_password):
+            if not await verify_password_async(password, user.hashed_password):
                 return None
 
             # 返回用户信息
@@ -79,7 +168,8 @@ class AuthService:
                 "phone": user.phone,
                 "email": user.email,
                 "full_name": user.full_name,
-                "is_active": user.is_active
+                "is_active": user.is_active,
+                "is_superuser": user.is_superuser
             }
 
     @staticmethod
@@ -94,15 +184,28 @@ class AuthService:
         if not user_id:
             return None
 
-        async for db in get_db_session():
+        # 每次都核对共享的用户版本号，其他 worker 变更用户后本进程的缓存立即失效
+        try:
+            version = await redis_client.get(_user_version_key(user_id))
+        except RedisError:
+            version = _NO_VERSION
+        cached = _user_cache.get(user_id)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        async with get_db_session() as db:
             user = await UserDao.get_by_id(db, user_id)
             if not user or not user.is_active:
                 return None
 
-            return {
+            user_info = {
                 "id": user.id,
                 "phone": user.phone,
                 "email": user.email,
                 "full_name": user.full_name,
-                "is_active": user.is_active
-            }
\ No newline at end of file
+                "is_active": user.is_active,
+                "is_superuser": user.is_superuser
+            }
+            if version is not _NO_VERSION:
+                _user_cache[user_id] = (version, user_info)
+            return user_info
\ No newline at end of file
@@ -1,8 +1,41 @@
 from app.db.dao.base_dao import SysParamDAO, MenuDAO, DepartmentDAO, RoleDAO
 from app.db.session import get_db_session
-from typing import Optional, List
+from typing import Optional, List, Tuple, Type, TypeVar, Callable, Awaitable, Any
+from pydantic import TypeAdapter
 from app.schemas.base import SysParamResponse, MenuResponse, DepartmentResponse, RoleResponse
 
+SchemaT = TypeVar("SchemaT")
+
+# 各响应模型从 ORM 对象取值的字段
+_SYS_PARAM_FIELDS = ("id", "key_name", "name", "value", "data_type", "description", "created_at", "updated_at")
+_MENU_FIELDS = ("id", "name", "parent_id", "path", "component", "redirect", "icon", "sort", "hidden",
+                "description", "created_at", "updated_at")
+_DEPARTMENT_FIELDS = ("id", "name", "parent_id", "leader_id", "phone", "email", "description", "created_at", "updated_at")
+_ROLE_FIELDS = ("id", "name", "code", "description", "created_at", "updated_at")
+
+# 列表结果整体交给 pydantic-core 一次转换，避免逐行构造模型
+_PARAM_LIST_ADAPTER = TypeAdapter(List[SysParamResponse])
+
+
+def _orm_values(orm_obj, fields: Tuple[str, ...]) -> dict:
+    """一次性从实例 __dict__ 取出已加载的列值，绕过逐个属性的描述符访问；
+    会话配置了 expire_on_commit=False，正常不会缺字段，缺失时再退回 getattr 触发加载"""
+    loaded = orm_obj.__dict__
+    return {field: loaded[field] if field in loaded else getattr(orm_obj, field) for field in fields}
+
+
+def _orm_to_schema(schema_cls: Type[SchemaT], orm_obj, fields: Tuple[str, ...]) -> SchemaT:
+    """将数据库对象转换为响应模型（数据来自数据库，已可信，跳过 Pydantic 校验）"""
+    return schema_cls.model_construct(**_orm_values(orm_obj, fields))
+
+
+async def _fetch_one(dao_method: Callable[..., Awaitable[Any]], schema_cls: Type[SchemaT],
+                     fields: Tuple[str, ...], *args) -> Optional[SchemaT]:
+    """在独立会话中调用 DAO 方法，并把返回的单个对象转换为响应模型（未找到时返回 None）"""
+    async with get_db_session() as db:
+        obj = await dao_method(db, *args)
+        return _orm_to_schema(schema_cls, obj, fields) if obj else None
+
 
 class SysParamService:
     """系统参数服务"""
@@ -10,96 +43,34 @@ class SysParamService:
     @staticmethod
     async def get_param_by_key(key_name: str) -> Optional[SysParamResponse]:
         """根据键名获取参数"""
-        async for db in get_db_session():
-            param = await SysParamDAO.get_by_key(db, key_name)
-            if param:
-                return SysParamResponse(
-                    id=param.id,
-                    key_name=param.key_name,
-                    name=param.name,
-                    value=param.value,
-                    data_type=param.data_type,
-                    description=param.description,
-                    created_at=param.created_at,
-                    updated_at=param.updated_at
-                )
-            return None
+        return await _fetch_one(SysParamDAO.get_by_key, SysParamResponse, _SYS_PARAM_FIELDS, key_name)
     
     @staticmethod
     async def get_param_by_id(param_id: int) -> Optional[SysParamResponse]:
         """根据ID获取参数"""
-        async for db in get_db_session():
-            param = await SysParamDAO.get_by_id(db, param_id)
-            if param:
-                return SysParamResponse(
-                    id=param.id,
-                    key_name=param.key_name,
-                    name=param.name,
-                    value=param.value,
-                    data_type=param.data_type,
-                    description=param.description,
-                    created_at=param.created_at,
-                    updated_at=param.updated_at
-                )
-            return None
+        return await _fetch_one(SysParamDAO.get_by_id, SysParamResponse, _SYS_PARAM_FIELDS, param_id)
     
     @staticmethod
-    async def get_all_params() -> List[SysParamResponse]:
-        """获取所有参数"""
-        async for db in get_db_session():
-            params = await SysParamDAO.get_all(db)
-            return [
-                SysParamResponse(
-                    id=param.id,
-                    key_name=param.key_name,
-                    name=param.name,
-                    value=param.value,
-                    data_type=param.data_type,
-                    description=param.description,
-                    created_at=param.created_at,
-                    updated_at=param.updated_at
-                )
-                for param in params
-            ]
+    async def get_all_params(skip: int = 0, limit: int = 100) -> List[SysParamResponse]:
+        """分页获取参数"""
+        async with get_db_session() as db:
+            params = await SysParamDAO.get_all(db, skip, limit)
+            return _PARAM_LIST_ADAPTER.validate_python(params, from_attributes=True)
     
     @staticmethod
     async def create_param(param_data: dict) -> SysParamResponse:
         """创建参数"""
-        async for db in get_db_session():
-            param = await SysParamDAO.create(db, param_data)
-            return SysParamResponse(
-                id=param.id,
-                key_name=param.key_name,
-                name=param.name,
-                value=param.value,
-                data_type=param.data_type,
-                description=param.description,
-                created_at=param.created_at,
-                updated_at=param.updated_at
-            )
+        return await _fetch_one(SysParamDAO.create, SysParamResponse, _SYS_PARAM_FIELDS, param_data)
     
     @staticmethod
     async def update_param(param_id: int, update_data: dict) -> Optional[SysParamResponse]:
         """更新参数"""
-        async for db in get_db_session():
-            param = await SysParamDAO.update(db, param_id, update_data)
-            if param:
-                return SysParamResponse(
-                    id=param.id,
-                    key_name=param.key_name,
-                    name=param.name,
-                    value=param.value,
-                    data_type=param.data_type,
-                    description=param.description,
-                    created_at=param.created_at,
-                    updated_at=param.updated_at
-                )
-            return None
+        return await _fetch_one(SysParamDAO.update, SysParamResponse, _SYS_PARAM_FIELDS, param_id, update_data)
     
     @staticmethod
     async def delete_param(param_id: int) -> bool:
         """删除参数"""
-        async for db in get_db_session():
+        async with get_db_session() as db:
             return await SysParamDAO.delete(db, param_id)
 
 
@@ -109,111 +80,39 @@ class MenuService:
     @staticmethod
     async def get_menu_by_id(menu_id: int) -> Optional[MenuResponse]:
         """根据ID获取菜单"""
-        async for db in get_db_session():
-            menu = await MenuDAO.get_by_id(db, menu_id)
-            if menu:
-                return MenuResponse(
-                    id=menu.id,
-                    name=menu.name,
-                    parent_id=menu.parent_id,
-                    path=menu.path,
-                    component=menu.component,
-                    redirect=menu.redirect,
-                    icon=menu.icon,
-                    sort=menu.sort,
-                    hidden=menu.hidden,
-                    description=menu.description,
-                    created_at=menu.created_at,
-                    updated_at=menu.updated_at
-                )
-            return None
+        return await _fetch_one(MenuDAO.get_by_id, MenuResponse, _MENU_FIELDS, menu_id)
     
     @staticmethod
     async def get_menu_tree() -> List[MenuResponse]:
         """获取菜单树"""
-        async for db in get_db_session():
-            menus = await MenuDAO.get_menu_tree(db)
-            return [
-                MenuResponse(
-                    id=menu.id,
-                    name=menu.name,
-                    parent_id=menu.parent_id,
-                    path=menu.path,
-                    component=menu.component,
-                    redirect=menu.redirect,
-                    icon=menu.icon,
-                    sort=menu.sort,
-                    hidden=menu.hidden,
-                    description=menu.description,
-                    children=[
-                        MenuResponse(
-                            id=child.id,
-                            name=child.name,
-                            parent_id=child.parent_id,
-                            path=child.path,
-                            component=child.component,
-                            redirect=child.redirect,
-                            icon=child.icon,
-                            sort=child.sort,
-                            hidden=child.hidden,
-                            description=child.description,
-                            created_at=child.created_at,
-                            updated_at=child.updated_at
-                        )
-                        for child in menu.children or []
-                    ] if menu.children else [],
-                    created_at=menu.created_at,
-                    updated_at=menu.updated_at
-                )
-                for menu in menus
-            ]
+        async with get_db_session() as db:
+            menus_by_parent = await MenuDAO.get_menu_tree(db)
+
+            def build(parent_id: Optional[int]) -> List[MenuResponse]:
+                return [
+                    MenuResponse.model_construct(
+                        **_orm_values(menu, _MENU_FIELDS),
+                        children=build(menu.id)
+                    )
+                    for menu in menus_by_parent.get(parent_id, [])
+                ]
+
+            return build(None)
     
     @staticmethod
     async def create_menu(menu_data: dict) -> MenuResponse:
         """创建菜单"""
-        async for db in get_db_session():
-            menu = await MenuDAO.create(db, menu_data)
-            return MenuResponse(
-                id=menu.id,
-                name=menu.name,
-                parent_id=menu.parent_id,
-                path=menu.path,
-                component=menu.component,
-                redirect=menu.redirect,
-                icon=menu.icon,
-                sort=menu.sort,
-                hidden=menu.hidden,
-                description=menu.description,
-                created_at=menu.created_at,
-                updated_at=menu.updated_at
-            )
+        return await _fetch_one(MenuDAO.create, MenuResponse, _MENU_FIELDS, menu_data)
     
     @staticmethod
     async def update_menu(menu_id: int, update_data: dict) -> Optional[MenuResponse]:
         """更新菜单"""
-        async for db in get_db_session():
-            menu = await MenuDAO.update(db, menu_id, update_data)
-            if menu:
-                return MenuResponse(
-                    id=menu.id,
-                    name=menu.name,
-                    parent_id=menu.parent_id,
-                    path=menu.path,
-                    component=menu.component,
-                    redirect=menu.redirect,
-                    icon=menu.icon,
-                    sort=menu.sort,
-                    hidden=menu.hidden,
-                    description=menu.description,
-                    created_at=menu.created_at,
-                    updated_at=menu.updated_at
-                )
-            return None
+        return await _fetch_one(MenuDAO.update, MenuResponse, _MENU_FIELDS, menu_id, update_data)
     
     @staticmethod
     async def delete_menu(menu_id: int) -> bool:
         """删除菜单"""
-        async for db in get_db_session():
+        async with get_db_session() as db:
             return await MenuDAO.delete(db, menu_id)
 
 
@@ -223,62 +122,22 @@ class DepartmentService:
     @staticmethod
     async def get_department_by_id(dept_id: int) -> Optional[DepartmentResponse]:
         """根据ID获取部门"""
-        async for db in get_db_session():
-            dept = await DepartmentDAO.get_by_id(db, dept_id)
-            if dept:
-                return DepartmentResponse(
-                    id=dept.id,
-                    name=dept.name,
-                    parent_id=dept.parent_id,
-                    leader_id=dept.leader_id,
-                    phone=dept.phone,
-                    email=dept.email,
-                    description=dept.description,
-                    created_at=dept.created_at,
-                    updated_at=dept.updated_at
-                )
-            return None
+        return await _fetch_one(DepartmentDAO.get_by_id, DepartmentResponse, _DEPARTMENT_FIELDS, dept_id)
     
     @staticmethod
     async def create_department(dept_data: dict) -> DepartmentResponse:
         """创建部门"""
-        async for db in get_db_session():
-            dept = await DepartmentDAO.create(db, dept_data)
-            return DepartmentResponse(
-                id=dept.id,
-                name=dept.name,
-                parent_id=dept.parent_id,
-                leader_id=dept.leader_id,
-                phone=dept.phone,
-                email=dept.email,
-                description=dept.description,
-                created_at=dept.created_at,
-                updated_at=dept.updated_at
-            )
+        return await _fetch_one(DepartmentDAO.create, DepartmentResponse, _DEPARTMENT_FIELDS, dept_data)
     
     @staticmethod
     async def update_department(dept_id: int, update_data: dict) -> Optional[DepartmentResponse]:
         """更新部门"""
-        async for db in get_db_session():
-            dept = await DepartmentDAO.update(db, dept_id, update_data)
-            if dept:
-                return DepartmentResponse(
-                    id=dept.id,
-                    name=dept.name,
-                    parent_id=dept.parent_id,
-                    leader_id=dept.leader_id,
-                    phone=dept.phone,
-                    email=dept.email,
-                    description=dept.description,
-                    created_at=dept.created_at,
-                    updated_at=dept.updated_at
-                )
-            return None
+        return await _fetch_one(DepartmentDAO.update, DepartmentResponse, _DEPARTMENT_FIELDS, dept_id, update_data)
     
     @staticmethod
     async def delete_department(dept_id: int) -> bool:
         """删除部门"""
-        async for db in get_db_session():
+        async with get_db_session() as db:
             return await DepartmentDAO.delete(db, dept_id)
 
 
@@ -288,67 +147,25 @@ class RoleService:
     @staticmethod
     async def get_role_by_id(role_id: int) -> Optional[RoleResponse]:
         """根据ID获取角色"""
-        async for db in get_db_session():
-            role = await RoleDAO.get_by_id(db, role_id)
-            if role:
-                return RoleResponse(
-                    id=role.id,
-                    name=role.name,
-                    code=role.code,
-                    description=role.description,
-                    created_at=role.created_at,
-                    updated_at=role.updated_at
-                )
-            return None
+        return await _fetch_one(RoleDAO.get_by_id, RoleResponse, _ROLE_FIELDS, role_id)
     
     @staticmethod
     async def get_role_by_code(code: str) -> Optional[RoleResponse]:
         """根据编码获取角色"""
-        async for db in get_db_session():
-            role = await RoleDAO.get_by_code(db, code)
-            if role:
-                return RoleResponse(
-                    id=role.id,
-                    name=role.name,
-                    code=role.code,
-                    description=role.description,
-                    created_at=role.created_at,
-                    updated_at=role.updated_at
-                )
-            return None
+        return await _fetch_one(RoleDAO.get_by_code, RoleResponse, _ROLE_FIELDS, code)
     
     @staticmethod
     async def create_role(role_data: dict) -> RoleResponse:
         """创建角色"""
-        async for db in get_db_session():
-            role = await RoleDAO.create(db, role_data)
-            return RoleResponse(
-                id=role.id,
-                name=role.name,
-                code=role.code,
-                description=role.description,
-                created_at=role.created_at,
-                updated_at=role.updated_at
-            )
+        return await _fetch_one(RoleDAO.create, RoleResponse, _ROLE_FIELDS, role_data)
     
     @staticmethod
     async def update_role(role_id: int, update_data: dict) -> Optional[RoleResponse]:
         """更新角色"""
-        async for db in get_db_session():
-            role = await RoleDAO.update(db, role_id, update_data)
-            if role:
-                return RoleResponse(
-                    id=role.id,
-                    name=role.name,
-                    code=role.code,
-                    description=role.description,
-                    created_at=role.created_at,
-                    updated_at=role.updated_at
-                )
-            return None
+        return await _fetch_one(RoleDAO.update, RoleResponse, _ROLE_FIELDS, role_id, update_data)
     
     @staticmethod
     async def delete_role(role_id: int) -> bool:
         """删除角色"""
-        async for db in get_db_session():
+        async with get_db_session() as db:
             return await RoleDAO.delete(db, role_id)
\ No newline at end of file
@@ -0,0 +1,83 @@
+import math
+import logging
+from typing import Optional, List
+import orjson
+from openai import AsyncOpenAI
+from redis.exceptions import RedisError
+from app.core.config.settings import settings
+from app.db.redis import get_redis_client
+
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(vector: List[float]) -> List[float]:
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+
+def _dot(a: List[float], b: List[float]) -> float:
+    return sum(x * y for x, y in zip(a, b))
+
+
+class ChatCache:
+    """聊天语义缓存：语义相近的提问直接返回已缓存的 Dify 响应，省去一次远程 LLM 调用
+
+    缓存只用于已有会话，按 认证用户ID + 会话ID 划分作用域，每个作用域是一个 Redis 列表，元素为
+    {"e": 归一化后的查询向量, "a": 回答}；新条目放在表头，超出上限的旧条目被截断。
+    只缓存回答文本，不保存 message_id 等标识，命中时不会把旧消息的标识返回给调用方。
+    Redis 或向量服务异常时一律视为未命中，不影响正常对话。
+    """
+
+    def __init__(self):
+        self.enabled = settings.CHAT_CACHE_ENABLED and bool(settings.OPENAI_API_KEY)
+        self.threshold = settings.CHAT_CACHE_THRESHOLD
+        self._openai = AsyncOpenAI(api_key=settings.OPENAI_API_KEY) if self.enabled else None
+
+    @staticmethod
+    def _key(user_id: str, conversation_id: str) -> str:
+        return f"chat_answer:{user_id}:{conversation_id}"
+
+    async def embed(self, query: str) -> Optional[List[float]]:
+        """计算查询向量（失败时返回 None）"""
+        try:
+            result = await self._openai.embeddings.create(
+                model=settings.CHAT_CACHE_EMBEDDING_MODEL,
+                input=query
+            )
+        except Exception as e:
+            logger.warning(f"Chat cache embedding error: {str(e)}")
+            return None
+        return _normalize(result.data[0].embedding)
+
+    async def lookup(self, embedding: List[float], user_id: str, conversation_id: str) -> Optional[str]:
+        """返回相似度最高且不低于阈值的缓存回答"""
+        try:
+            entries = await get_redis_client().lrange(self._key(user_id, conversation_id), 0, -1)
+        except RedisError as e:
+            logger.warning(f"Chat cache lookup error: {str(e)}")
+            return None
+
+        best_score, best_answer = self.threshold, None
+        for raw in entries:
+            entry = orjson.loads(raw)
+            score = _dot(embedding, entry["e"])
+            if score >= best_score:
+                best_score, best_answer = score, entry["a"]
+        return best_answer
+
+    async def store(self, embedding: List[float], user_id: str, conversation_id: str, answer: str) -> None:
+        """写入缓存并刷新作用域的过期时间"""
+        key = self._key(user_id, conversation_id)
+        try:
+            async with get_redis_client().pipeline(transaction=False) as pipe:
+                pipe.lpush(key, orjson.dumps({"e": embedding, "a": answer}))
+                pipe.ltrim(key, 0, settings.CHAT_CACHE_MAX_ENTRIES - 1)
+                pipe.expire(key, settings.CHAT_CACHE_TTL)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Chat cache store error: {str(e)}")
+
+
+# 全局共享的聊天语义缓存
+chat_cache = ChatCache()
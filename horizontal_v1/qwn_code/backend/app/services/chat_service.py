@@ -1,127 +1,68 @@
-import httpx
-from typing import Optional, Dict, Any
-from app.core.config.settings import settings
+from typing import Optional, Dict, Any, AsyncIterator, List, Tuple
+from app.services.dify_client import DifyClient, dify_client
+from app.services.chat_cache import chat_cache
 from app.schemas.chat import ChatMessageRequest, ChatMessageResponse, ChatHistoryRequest, ChatHistoryResponse
-import json
 import logging
+import orjson
 
 
 logger = logging.getLogger(__name__)
 
+_MESSAGE_FIELDS = ("id", "query", "answer", "created_at")
+_CONVERSATION_FIELDS = ("id", "name", "created_at", "updated_at")
 
-class DifyClient:
-    """Dify客户端，用于与Dify服务进行交互"""
-    
-    def __init__(self):
-        self.base_url = settings.DIFY_BASE_URL
-        self.api_key = settings.DIFY_API_KEY
-        self.headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json"
-        }
-    
-    async def chat_completion(self, query: str, conversation_id: Optional[str] = None, 
-                           user: Optional[str] = None) -> Dict[str, Any]:
-        """聊天补全"""
-        url = f"{self.base_url}/chat-messages"
-        
-        payload = {
-            "inputs": {},
-            "query": query,
-            "response_mode": "blocking",  # 使用阻塞模式以获得完整响应
-            "conversation_id": conversation_id,
-            "user": user or "default_user"
-        }
-        
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(url, headers=self.headers, json=payload)
-                response.raise_for_status()
-                return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Dify API HTTP error: {e.response.status_code} - {e.response.text}")
-            raise
-        except httpx.RequestError as e:
-            logger.error(f"Dify API request error: {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error calling Dify API: {str(e)}")
-            raise
-    
-    async def get_conversations(self, user: str = "default_user", 
-                              limit: int = 20, offset: int = 0) -> Dict[str, Any]:
-        """获取会话列表"""
-        url = f"{self.base_url}/conversations"
-        
-        params = {
-            "user": user,
-            "limit": limit,
-            "offset": offset
-        }
-        
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, headers=self.headers, params=params)
-                response.raise_for_status()
-                return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Dify API HTTP error: {e.response.status_code} - {e.response.text}")
-            raise
-        except httpx.RequestError as e:
-            logger.error(f"Dify API request error: {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error calling Dify API: {str(e)}")
-            raise
-    
-    async def get_conversation_messages(self, conversation_id: str, 
-                                     user: str = "default_user",
-                                     limit: int = 20, offset: int = 0) -> Dict[str, Any]:
-        """获取会话消息"""
-        url = f"{self.base_url}/conversations/{conversation_id}/messages"
-        
-        params = {
-            "user": user,
-            "limit": limit,
-            "offset": offset
-        }
-        
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, headers=self.headers, params=params)
-                response.raise_for_status()
-                return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Dify API HTTP error: {e.response.status_code} - {e.response.text}")
-            raise
-        except httpx.RequestError as e:
-            logger.error(f"Dify API request error: {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error calling Dify API: {str(e)}")
-            raise
+
+def _check_fields(records: List[Dict[str, Any]], fields: Tuple[str, ...], kind: str) -> None:
+    """逐条直接取值前先校验首条记录的字段，Dify 返回格式变化时给出明确的错误而不是 KeyError"""
+    if records:
+        missing = [field for field in fields if field not in records[0]]
+        if missing:
+            raise ValueError(f"Dify 返回的{kind}缺少字段: {', '.join(missing)}")
 
 
 class ChatService:
     """聊天服务"""
     
-    def __init__(self):
-        self.dify_client = DifyClient()
+    def __init__(self, client: DifyClient = dify_client):
+        # 默认复用应用级共享的 Dify 客户端，不在每次实例化时新建连接池
+        self.dify_client = client
     
-    async def chat_completion(self, request: ChatMessageRequest) -> ChatMessageResponse:
-        """聊天补全"""
+    async def chat_completion(self, request: ChatMessageRequest,
+                              user_id: Optional[str] = None) -> ChatMessageResponse:
+        """聊天补全（user_id 为认证用户ID，用于划分语义缓存与合并并发的重复请求）
+
+        语义缓存命中时直接返回缓存的回答而不调用 Dify，这一轮问答不会写入 Dify 的会话历史；
+        需要完整历史时关闭 CHAT_CACHE_ENABLED。
+        """
         try:
+            # 语义缓存只用于已有会话且限定在认证用户自己的会话内；新会话必须由 Dify 创建
+            use_cache = chat_cache.enabled and bool(request.conversation_id) and bool(user_id)
+            embedding = await chat_cache.embed(request.query) if use_cache else None
+            if embedding is not None:
+                answer = await chat_cache.lookup(embedding, user_id, request.conversation_id)
+                if answer:
+                    return ChatMessageResponse(
+                        code=1000,
+                        message="success",
+                        result={"answer": answer, "conversation_id": request.conversation_id, "message_id": ""}
+                    )
+            
             response_data = await self.dify_client.chat_completion(
                 query=request.query,
                 conversation_id=request.conversation_id,
-                user=request.user_id
+                user=request.user_id,
+                auth_user_id=user_id
             )
+            answer = response_data.get("answer", "")
+            # 空回答不缓存，否则之后相似的提问会一直拿到空回答
+            if embedding is not None and answer:
+                await chat_cache.store(embedding, user_id, request.conversation_id, answer)
             
             return ChatMessageResponse(
                 code=1000,
                 message="success",
                 result={
-                    "answer": response_data.get("answer", ""),
+                    "answer": answer,
                     "conversation_id": response_data.get("conversation_id", ""),
                     "message_id": response_data.get("id", "")
                 }
@@ -134,6 +75,37 @@ class ChatService:
                 result={}
             )
     
+    async def stream_chat_completion(self, request: ChatMessageRequest) -> AsyncIterator[bytes]:
+        """流式聊天补全：以 SSE 形式逐段转发回答"""
+        try:
+            async for event in self.dify_client.chat_completion_stream(
+                query=request.query,
+                conversation_id=request.conversation_id,
+                user=request.user_id
+            ):
+                name = event.get("event")
+                if name in ("message", "agent_message"):
+                    frame = {
+                        "event": "message",
+                        "answer": event.get("answer", ""),
+                        "conversation_id": event.get("conversation_id", ""),
+                        "message_id": event.get("message_id", "")
+                    }
+                elif name == "message_end":
+                    frame = {
+                        "event": "message_end",
+                        "conversation_id": event.get("conversation_id", ""),
+                        "message_id": event.get("message_id", "")
+                    }
+                elif name == "error":
+                    frame = {"event": "error", "code": 500, "message": event.get("message", "")}
+                else:
+                    continue
+                yield b"data: " + orjson.dumps(frame) + b"\n\n"
+        except Exception as e:
+            logger.error(f"Stream chat completion error: {str(e)}")
+            yield b"data: " + orjson.dumps({"event": "error", "code": 500, "message": f"聊天服务错误: {str(e)}"}) + b"\n\n"
+    
     async def get_chat_history(self, request: ChatHistoryRequest) -> ChatHistoryResponse:
         """获取聊天历史"""
         try:
@@ -143,23 +115,20 @@ class ChatService:
                 offset=request.offset
             )
             
-            # 格式化响应数据
-            messages_data = response_data.get("data", [])
-            items = []
-            for msg in messages_data:
-                items.append({
-                    "id": msg.get("id", ""),
-                    "query": msg.get("query", ""),
-                    "answer": msg.get("answer", ""),
-                    "created_at": msg.get("created_at", "")
-                })
+            # 格式化响应数据（Dify 返回的消息字段齐全，校验首条后直接取值）
+            messages = response_data.get("data", [])
+            _check_fields(messages, _MESSAGE_FIELDS, "消息")
+            items = [
+                {"id": msg["id"], "query": msg["query"], "answer": msg["answer"], "created_at": msg["created_at"]}
+                for msg in messages
+            ]
             
             return ChatHistoryResponse(
                 code=1000,
                 message="success",
                 result={
                     "items": items,
-                    "total": len(items)
+                    "total": response_data.get("total", len(items))
                 }
             )
         except Exception as e:
@@ -172,31 +141,28 @@ class ChatService:
     
     async def get_conversations_list(self, user_id: str = "default_user", 
                                    limit: int = 20, offset: int = 0) -> Dict[str, Any]:
-        """获取会话列表"""
+        """获取会话列表（同时在后台预取排在前面的会话消息）"""
         try:
-            response_data = await self.dify_client.get_conversations(
+            response_data = await self.dify_client.get_conversations_with_prefetch(
                 user=user_id,
                 limit=limit,
                 offset=offset
             )
             
-            # 格式化响应数据
-            conversations_data = response_data.get("data", [])
-            items = []
-            for conv in conversations_data:
-                items.append({
-                    "id": conv.get("id", ""),
-                    "name": conv.get("name", ""),
-                    "created_at": conv.get("created_at", ""),
-                    "updated_at": conv.get("updated_at", "")
-                })
+            # 格式化响应数据（Dify 返回的会话字段齐全，校验首条后直接取值）
+            conversations = response_data.get("data", [])
+            _check_fields(conversations, _CONVERSATION_FIELDS, "会话")
+            items = [
+                {"id": conv["id"], "name": conv["name"], "created_at": conv["created_at"], "updated_at": conv["updated_at"]}
+                for conv in conversations
+            ]
             
             return {
                 "code": 1000,
                 "message": "success",
                 "result": {
                     "items": items,
-                    "total": len(items)
+                    "total": response_data.get("total", len(items))
                 }
             }
         except Exception as e:
@@ -205,4 +171,26 @@ class ChatService:
                 "code": 500,
                 "message": f"获取会话列表错误: {str(e)}",
                 "result": {"items": [], "total": 0}
-            }
\ No newline at end of file
+            }
+    
+    async def stream_conversations_list(self, user_id: str = "default_user",
+                                        limit: int = 20, offset: int = 0) -> AsyncIterator[bytes]:
+        """以 NDJSON 形式逐行输出会话列表"""
+        try:
+            response_data = await self.dify_client.get_conversations(
+                user=user_id,
+                limit=limit,
+                offset=offset
+            )
+        except Exception as e:
+            logger.error(f"Stream conversations list error: {str(e)}")
+            yield orjson.dumps({"code": 500, "message": f"获取会话列表错误: {str(e)}"}) + b"\n"
+            return
+
+        for conv in response_data.get("data", []):
+            yield orjson.dumps({
+                "id": conv.get("id", ""),
+                "name": conv.get("name", ""),
+                "created_at": conv.get("created_at", ""),
+                "updated_at": conv.get("updated_at", "")
+            }) + b"\n"
\ No newline at end of file
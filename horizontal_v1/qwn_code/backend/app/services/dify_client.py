@@ -1,12 +1,66 @@
+import asyncio
+import contextlib
+import functools
+import inspect
 import httpx
-from typing import Optional, Dict, Any, List
+from cachetools import TTLCache
+from redis.exceptions import RedisError
+from typing import Optional, Dict, Any, List, AsyncIterator
 from app.core.config.settings import settings
-import json
+from app.db.redis import redis_client
 import logging
+import orjson
 
 
 logger = logging.getLogger(__name__)
 
+# 预取消息的保留时间（秒），覆盖用户从会话列表点进会话的时间窗口
+PREFETCH_TTL = 10
+# 会话列表 / 会话消息在 Redis 中的缓存有效期（秒）
+CONVERSATION_CACHE_TTL = 60
+
+
+def _conversations_key(user: str, limit: int, offset: int) -> str:
+    return f"dify:conversations:{user}:{limit}:{offset}"
+
+
+def _messages_key(user: str, conversation_id: str, limit: int, offset: int) -> str:
+    return f"dify:messages:{user}:{conversation_id}:{limit}:{offset}"
+
+
+def _log_dify_error(e: Exception) -> None:
+    if isinstance(e, httpx.HTTPStatusError):
+        logger.error(f"Dify API HTTP error: {e.response.status_code} - {e.response.text}")
+    elif isinstance(e, httpx.RequestError):
+        logger.error(f"Dify API request error: {str(e)}")
+    else:
+        logger.error(f"Unexpected error calling Dify API: {str(e)}")
+
+
+def _dify_call(fn):
+    """统一记录 Dify 调用异常后原样抛出；方法体只保留正常路径（兼容协程与异步生成器）"""
+    if inspect.isasyncgenfunction(fn):
+        @functools.wraps(fn)
+        async def stream_wrapper(*args, **kwargs):
+            try:
+                # 外层生成器被关闭（如客户端断开）时同步关闭内层生成器，及时释放其持有的 httpx 流
+                async with contextlib.aclosing(fn(*args, **kwargs)) as stream:
+                    async for item in stream:
+                        yield item
+            except Exception as e:
+                _log_dify_error(e)
+                raise
+        return stream_wrapper
+
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        try:
+            return await fn(*args, **kwargs)
+        except Exception as e:
+            _log_dify_error(e)
+            raise
+    return wrapper
+
 
 class DifyClient:
     """Dify客户端，用于与Dify服务进行交互"""
@@ -18,107 +72,219 @@ class DifyClient:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        # 长连接复用的共享客户端：连接池、DNS 解析与 TLS 握手在各次调用间复用
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers=self.headers,
+            timeout=settings.DIFY_HTTP_TIMEOUT,
+            http2=True,  # TLS 下协商 HTTP/2，并发请求复用同一连接
+            limits=httpx.Limits(
+                max_connections=settings.DIFY_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.DIFY_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.DIFY_HTTP_KEEPALIVE_EXPIRY
+            )
+        )
+        # 预取的会话消息：(user, conversation_id, limit, offset) -> 响应
+        self._prefetched: TTLCache = TTLCache(maxsize=1024, ttl=PREFETCH_TTL)
+        # 持有后台任务（预取、缓存刷新）的引用，防止任务未完成就被回收
+        self._background_tasks: set = set()
+        # 正在后台刷新的缓存键，避免同一个键被并发重复刷新
+        self._refreshing: set = set()
+        # 进行中的聊天请求：(auth_user_id, query, conversation_id, user) -> 任务
+        self._inflight_chats: Dict[tuple, asyncio.Task] = {}
+    
+    async def aclose(self):
+        """关闭共享客户端（应用关闭时调用）"""
+        await self._client.aclose()
+    
+    def _spawn(self, coro) -> None:
+        """启动后台任务并持有其引用"""
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._on_background_done)
+    
+    def _on_background_done(self, task: asyncio.Task) -> None:
+        self._background_tasks.discard(task)
+        # 异常已由 _dify_call 记录，这里取出即可，避免 "exception was never retrieved"
+        if not task.cancelled():
+            task.exception()
+    
+    async def _cached(self, key: str, fetch) -> Dict[str, Any]:
+        """Redis 读穿缓存：命中时直接返回并在后台刷新（stale-while-revalidate），未命中时同步拉取"""
+        try:
+            raw = await redis_client.get(key)
+        except RedisError:
+            raw = None
+        if raw is None:
+            return await self._store(key, await fetch())
+        if key not in self._refreshing:
+            self._refreshing.add(key)
+            self._spawn(self._revalidate(key, fetch))
+        return orjson.loads(raw)
+    
+    async def _revalidate(self, key: str, fetch) -> None:
+        try:
+            await self._store(key, await fetch())
+        finally:
+            self._refreshing.discard(key)
+    
+    async def _store(self, key: str, response: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            await redis_client.set(key, orjson.dumps(response), ex=CONVERSATION_CACHE_TTL)
+        except RedisError as e:
+            logger.warning(f"Dify cache store error: {str(e)}")
+        return response
+    
+    async def __aenter__(self) -> "DifyClient":
+        return self
+    
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+    
+    @_dify_call
+    async def _request(self, method: str, path: str, **kwargs) -> Dict[str, Any]:
+        """发送请求并解析 JSON 响应；非 2xx 抛出 HTTPStatusError，异常统一由 _dify_call 记录"""
+        response = await self._client.request(method, path, **kwargs)
+        response.raise_for_status()
+        return orjson.loads(response.content)
     
     async def chat_completion(self, query: str, conversation_id: Optional[str] = None, 
-                           user: Optional[str] = None) -> Dict[str, Any]:
-        """聊天补全"""
-        url = f"{self.base_url}/chat-messages"
+                           user: Optional[str] = None,
+                           auth_user_id: Optional[str] = None) -> Dict[str, Any]:
+        """聊天补全
+
+        传入认证用户ID且为已有会话时，同一用户在同一会话中并发发出的相同提问合并为一次 Dify 调用；
+        新会话或未认证的调用各自发送，避免不同的人共用 Dify 新建的同一个会话
+        """
+        if not (conversation_id and auth_user_id):
+            return await self._chat_completion(query, conversation_id, user)
         
+        key = (auth_user_id, query, conversation_id, user)
+        task = self._inflight_chats.get(key)
+        if task is None:
+            task = asyncio.create_task(self._chat_completion(query, conversation_id, user))
+            self._inflight_chats[key] = task
+            task.add_done_callback(lambda _: self._inflight_chats.pop(key, None))
+        # shield：某个调用方被取消时不影响共享同一请求的其他调用方
+        return await asyncio.shield(task)
+    
+    async def _chat_completion(self, query: str, conversation_id: Optional[str],
+                               user: Optional[str]) -> Dict[str, Any]:
+        """消费流式响应并拼接成与阻塞模式相同结构的结果"""
+        result: Dict[str, Any] = {}
+        chunks: List[str] = []
+        async for event in self.chat_completion_stream(query, conversation_id, user):
+            name = event.get("event")
+            if name in ("message", "agent_message"):
+                if not result:
+                    result = {
+                        "id": event.get("message_id", ""),
+                        "conversation_id": event.get("conversation_id", ""),
+                        "created_at": event.get("created_at")
+                    }
+                chunks.append(event.get("answer", ""))
+            elif name == "message_end":
+                result.setdefault("id", event.get("message_id", ""))
+                result.setdefault("conversation_id", event.get("conversation_id", ""))
+                result["metadata"] = event.get("metadata", {})
+            elif name == "error":
+                raise RuntimeError(f"Dify stream error: {event.get('message', '')}")
+        result["answer"] = "".join(chunks)
+        return result
+    
+    @_dify_call
+    async def chat_completion_stream(self, query: str, conversation_id: Optional[str] = None,
+                                     user: Optional[str] = None) -> AsyncIterator[Dict[str, Any]]:
+        """流式聊天补全：逐个产出 Dify 的 SSE 事件（message / message_end / error 等）
+
+        流正常结束后清除该用户的会话列表缓存与该会话的消息缓存，随后的查询能看到新消息
+        """
         payload = {
             "inputs": {},
             "query": query,
-            "response_mode": "blocking",  # 使用阻塞模式以获得完整响应
+            "response_mode": "streaming",
             "conversation_id": conversation_id,
             "user": user or "default_user"
         }
         
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.post(url, headers=self.headers, json=payload)
+        async with self._client.stream("POST", "/chat-messages", json=payload) as response:
+            if response.is_error:
+                # 流式响应需先读完响应体，错误日志里才能取到 text
+                await response.aread()
                 response.raise_for_status()
-                return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Dify API HTTP error: {e.response.status_code} - {e.response.text}")
-            raise
-        except httpx.RequestError as e:
-            logger.error(f"Dify API request error: {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error calling Dify API: {str(e)}")
-            raise
+            async for line in response.aiter_lines():
+                if line.startswith("data:"):
+                    yield orjson.loads(line[5:])
+        await self._invalidate_conversations(user or "default_user", conversation_id)
     
     async def get_conversations(self, user: str = "default_user", 
                               limit: int = 20, offset: int = 0) -> Dict[str, Any]:
-        """获取会话列表"""
-        url = f"{self.base_url}/conversations"
-        
-        params = {
-            "user": user,
-            "limit": limit,
-            "offset": offset
-        }
-        
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, headers=self.headers, params=params)
-                response.raise_for_status()
-                return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Dify API HTTP error: {e.response.status_code} - {e.response.text}")
-            raise
-        except httpx.RequestError as e:
-            logger.error(f"Dify API request error: {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error calling Dify API: {str(e)}")
-            raise
+        """获取会话列表（经 Redis 缓存）"""
+        return await self._cached(
+            _conversations_key(user, limit, offset),
+            lambda: self._fetch_conversations(user, limit, offset)
+        )
+    
+    async def _fetch_conversations(self, user: str, limit: int, offset: int) -> Dict[str, Any]:
+        params = {"user": user, "limit": limit, "offset": offset}
+        return await self._request("GET", "/conversations", params=params)
+    
+    async def get_conversations_with_prefetch(self, user: str = "default_user",
+                                              limit: int = 20, offset: int = 0,
+                                              prefetch_n: int = 3) -> Dict[str, Any]:
+        """获取会话列表，并在后台预取前 prefetch_n 个会话的首页消息"""
+        response = await self.get_conversations(user=user, limit=limit, offset=offset)
+        for conv in response.get("data", [])[:prefetch_n]:
+            self._spawn(self._prefetch_messages(conv["id"], user))
+        return response
+    
+    async def _prefetch_messages(self, conversation_id: str, user: str,
+                                 limit: int = 20, offset: int = 0) -> None:
+        # 预取失败时任务异常被丢弃，等真正请求时再重新调用
+        self._prefetched[(user, conversation_id, limit, offset)] = await self._store(
+            _messages_key(user, conversation_id, limit, offset),
+            await self._fetch_conversation_messages(conversation_id, user, limit, offset)
+        )
     
     async def get_conversation_messages(self, conversation_id: str, 
                                      user: str = "default_user",
                                      limit: int = 20, offset: int = 0) -> Dict[str, Any]:
-        """获取会话消息"""
-        url = f"{self.base_url}/conversations/{conversation_id}/messages"
-        
-        params = {
-            "user": user,
-            "limit": limit,
-            "offset": offset
-        }
-        
-        try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.get(url, headers=self.headers, params=params)
-                response.raise_for_status()
-                return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Dify API HTTP error: {e.response.status_code} - {e.response.text}")
-            raise
-        except httpx.RequestError as e:
-            logger.error(f"Dify API request error: {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error calling Dify API: {str(e)}")
-            raise
+        """获取会话消息（预取结果只使用一次，其余请求经 Redis 缓存）"""
+        cached = self._prefetched.pop((user, conversation_id, limit, offset), None)
+        if cached is not None:
+            return cached
+        return await self._cached(
+            _messages_key(user, conversation_id, limit, offset),
+            lambda: self._fetch_conversation_messages(conversation_id, user, limit, offset)
+        )
     
-    async def rename_conversation(self, conversation_id: str, name: str) -> Dict[str, Any]:
-        """重命名会话"""
-        url = f"{self.base_url}/conversations/{conversation_id}"
-        
-        payload = {
-            "name": name
-        }
-        
+    async def _fetch_conversation_messages(self, conversation_id: str, user: str,
+                                           limit: int, offset: int) -> Dict[str, Any]:
+        params = {"user": user, "limit": limit, "offset": offset}
+        return await self._request("GET", f"/conversations/{conversation_id}/messages", params=params)
+    
+    async def rename_conversation(self, conversation_id: str, name: str,
+                                  user: str = "default_user") -> Dict[str, Any]:
+        """重命名会话，并清除该用户的会话列表缓存与该会话的消息缓存"""
+        payload = {"name": name, "user": user}
+        response = await self._request("PATCH", f"/conversations/{conversation_id}", json=payload)
+        await self._invalidate_conversations(user, conversation_id)
+        return response
+    
+    async def _invalidate_conversations(self, user: str, conversation_id: Optional[str] = None) -> None:
+        """清除用户的会话列表缓存；传入 conversation_id 时一并清除该会话的消息缓存与预取结果"""
+        patterns = [f"dify:conversations:{user}:*"]
+        if conversation_id:
+            patterns.append(f"dify:messages:{user}:{conversation_id}:*")
+            for key in [key for key in self._prefetched if key[:2] == (user, conversation_id)]:
+                self._prefetched.pop(key, None)
         try:
-            async with httpx.AsyncClient(timeout=30.0) as client:
-                response = await client.patch(url, headers=self.headers, json=payload)
-                response.raise_for_status()
-                return response.json()
-        except httpx.HTTPStatusError as e:
-            logger.error(f"Dify API HTTP error: {e.response.status_code} - {e.response.text}")
-            raise
-        except httpx.RequestError as e:
-            logger.error(f"Dify API request error: {str(e)}")
-            raise
-        except Exception as e:
-            logger.error(f"Unexpected error calling Dify API: {str(e)}")
-            raise
\ No newline at end of file
+            keys = [key for pattern in patterns async for key in redis_client.scan_iter(match=pattern)]
+            if keys:
+                await redis_client.delete(*keys)
+        except RedisError as e:
+            logger.warning(f"Dify cache invalidate error: {str(e)}")
+
+
+# 全局共享的 Dify 客户端
+dify_client = DifyClient()
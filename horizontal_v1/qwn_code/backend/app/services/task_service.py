@@ -1,10 +1,59 @@
-from typing import Optional, List
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Optional, List, AsyncIterator, Callable, Any
 from app.db.dao.task_dao import TaskInfoDAO, TaskLogDAO
 from app.db.session import get_db_session
 from app.models.task import TaskInfo
 from app.schemas.task import TaskCreateRequest, TaskUpdateRequest, TaskResponse, TaskLogResponse, TaskLogItem
 from app.core.config.settings import settings
 import asyncio
+import importlib
+import inspect
+import logging
+import orjson
+
+
+logger = logging.getLogger(__name__)
+
+# 任务处理器在独立线程池中执行，慢任务不会阻塞事件循环
+_TASK_POOL = ThreadPoolExecutor(max_workers=settings.TASK_WORKERS, thread_name_prefix="task")
+# 持有执行中任务的引用，防止执行未结束就被回收
+_running_tasks: set = set()
+
+
+def _resolve_handler(path: str) -> Callable[[int], Any]:
+    """按 "包.模块:函数" 或 "包.模块.函数" 解析任务处理器，只允许加载 TASK_HANDLER_PREFIX 下的模块"""
+    module_name, _, attr = path.replace(":", ".").rpartition(".")
+    if not (module_name + ".").startswith(settings.TASK_HANDLER_PREFIX):
+        raise ValueError(f"任务处理器 {path} 不在允许的模块范围内")
+    return getattr(importlib.import_module(module_name), attr)
+
+
+async def _run_task(task_id: int, handler: Callable[[int], Any]) -> None:
+    """执行处理器（同步函数放入线程池，协程函数直接在事件循环中等待），结束后记录任务日志与最后运行时间"""
+    started_at = datetime.now(timezone.utc)
+    try:
+        if inspect.iscoroutinefunction(handler):
+            result = await handler(task_id)
+        else:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(_TASK_POOL, handler, task_id)
+        status, message = "SUCCESS", "执行成功" if result is None else str(result)
+    except Exception as e:
+        logger.error(f"Task {task_id} failed: {str(e)}")
+        status, message = "FAILED", str(e)
+    try:
+        async with get_db_session() as db:
+            await TaskLogDAO.create(db, {"task_id": task_id, "status": status, "message": message})
+            await TaskInfoDAO.update(db, task_id, {"last_run_time": started_at})
+    except Exception as e:
+        # 后台任务无人等待结果，记录失败原因，避免异常被静默丢弃
+        logger.error(f"Failed to record result of task {task_id} ({status}): {str(e)}")
+
+
+def shutdown_task_pool() -> None:
+    """关闭任务线程池（应用关闭时调用），尚未开始的任务直接取消"""
+    _TASK_POOL.shutdown(wait=False, cancel_futures=True)
 
 
 class TaskService:
@@ -13,89 +62,48 @@ class TaskService:
     @staticmethod
     async def get_task_by_id(task_id: int) -> Optional[TaskResponse]:
         """根据ID获取任务"""
-        async for db in get_db_session():
+        async with get_db_session() as db:
             task = await TaskInfoDAO.get_by_id(db, task_id)
             if task:
-                return TaskResponse(
-                    id=task.id,
-                    name=task.name,
-                    type=task.type,
-                    cron_expression=task.cron_expression,
-                    handler=task.handler,
-                    description=task.description,
-                    enabled=task.enabled,
-                    status=task.status,
-                    last_run_time=task.last_run_time,
-                    next_run_time=task.next_run_time,
-                    created_at=task.created_at,
-                    updated_at=task.updated_at
-                )
+                return TaskResponse.model_validate(task)
             return None
     
+    @staticmethod
+    async def get_all_tasks(skip: int = 0, limit: int = 100) -> List[TaskResponse]:
+        """分页获取任务"""
+        async with get_db_session() as db:
+            tasks = await TaskInfoDAO.get_all(db, skip, limit)
+            return [TaskResponse.model_validate(task) for task in tasks]
+    
     @staticmethod
     async def create_task(task_data: dict) -> TaskResponse:
         """创建任务"""
-        async for db in get_db_session():
+        async with get_db_session() as db:
             task = await TaskInfoDAO.create(db, task_data)
-            return TaskResponse(
-                id=task.id,
-                name=task.name,
-                type=task.type,
-                cron_expression=task.cron_expression,
-                handler=task.handler,
-                description=task.description,
-                enabled=task.enabled,
-                status=task.status,
-                last_run_time=task.last_run_time,
-                next_run_time=task.next_run_time,
-                created_at=task.created_at,
-                updated_at=task.updated_at
-            )
+            return TaskResponse.model_validate(task)
     
     @staticmethod
     async def update_task(task_id: int, update_data: dict) -> Optional[TaskResponse]:
         """更新任务"""
-        async for db in get_db_session():
+        async with get_db_session() as db:
             task = await TaskInfoDAO.update(db, task_id, update_data)
             if task:
-                return TaskResponse(
-                    id=task.id,
-                    name=task.name,
-                    type=task.type,
-                    cron_expression=task.cron_expression,
-                    handler=task.handler,
-                    description=task.description,
-                    enabled=task.enabled,
-                    status=task.status,
-                    last_run_time=task.last_run_time,
-                    next_run_time=task.next_run_time,
-                    created_at=task.created_at,
-                    updated_at=task.updated_at
-                )
+                return TaskResponse.model_validate(task)
             return None
     
     @staticmethod
     async def delete_task(task_id: int) -> bool:
         """删除任务"""
-        async for db in get_db_session():
+        async with get_db_session() as db:
             return await TaskInfoDAO.delete(db, task_id)
     
     @staticmethod
     async def get_task_logs(task_id: Optional[int], page: int = 1, size: int = 20) -> TaskLogResponse:
         """获取任务日志"""
-        async for db in get_db_session():
+        async with get_db_session() as db:
             logs, total = await TaskLogDAO.get_paginated_logs(db, task_id, page, size)
             
-            items = [
-                TaskLogItem(
-                    id=log.id,
-                    task_id=log.task_id,
-                    status=log.status,
-                    message=log.message,
-                    created_at=log.created_at
-                )
-                for log in logs
-            ]
+            items = [TaskLogItem.model_validate(log) for log in logs]
             
             return TaskLogResponse(
                 items=items,
@@ -104,28 +112,69 @@ class TaskService:
                 size=size
             )
     
+    @staticmethod
+    async def get_task_logs_json(task_id: Optional[int], page: int = 1, size: int = 20) -> bytes:
+        """获取任务日志并直接序列化为 JSON（字段与 TaskLogResponse 的驼峰输出一致）
+
+        列表接口只读不改，跳过 ORM 对象与 Pydantic 模型，由行元组一次性编码
+        """
+        async with get_db_session() as db:
+            rows, total = await TaskLogDAO.get_paginated_log_rows(db, task_id, page, size)
+        return orjson.dumps(
+            {
+                "items": [
+                    {"id": log_id, "taskId": log_task_id, "status": status, "message": message, "createdAt": created_at}
+                    for log_id, log_task_id, status, message, created_at in rows
+                ],
+                "total": total,
+                "page": page,
+                "size": size
+            },
+            option=orjson.OPT_UTC_Z  # UTC 时间以 Z 结尾，与 Pydantic 的输出保持一致
+        )
+    
+    @staticmethod
+    async def stream_task_logs(task_id: Optional[int], page: int = 1, size: int = 20) -> AsyncIterator[bytes]:
+        """以 NDJSON 形式逐行输出任务日志"""
+        async with get_db_session() as db:
+            async for log in TaskLogDAO.stream_logs(db, task_id, page, size):
+                item = TaskLogItem.model_validate(log)
+                yield orjson.dumps(item.model_dump(by_alias=True)) + b"\n"
+    
     @staticmethod
     async def execute_task_once(task_id: int) -> dict:
-        """执行任务一次"""
-        # 这里应该实现具体的任务执行逻辑
-        # 为了演示，我们只是返回成功
+        """执行任务一次：提交到线程池后立即返回，执行结果写入任务日志"""
+        async with get_db_session() as db:
+            task = await TaskInfoDAO.get_by_id(db, task_id)
+        if task is None:
+            return {"success": False, "message": f"任务 {task_id} 不存在"}
+        try:
+            handler = _resolve_handler(task.handler)
+        except (ImportError, AttributeError, ValueError):
+            return {"success": False, "message": f"任务处理器 {task.handler} 无法加载"}
+        
+        job = asyncio.create_task(_run_task(task_id, handler))
+        _running_tasks.add(job)
+        job.add_done_callback(_running_tasks.discard)
         return {
             "success": True,
-            "message": f"任务 {task_id} 已执行"
+            "message": f"任务 {task_id} 已提交执行"
         }
     
     @staticmethod
     async def start_task(task_id: int) -> dict:
         """启动任务"""
         # 这里应该实现任务启动逻辑
-        async for db in get_db_session():
-            await TaskInfoDAO.update(db, task_id, {"enabled": True, "status": "RUNNING"})
+        async with get_db_session() as db:
+            # 条件更新：任务已在运行时不产生写入
+            await TaskInfoDAO.set_state(db, task_id, True, "RUNNING")
             return {"success": True, "message": f"任务 {task_id} 已启动"}
     
     @staticmethod
     async def stop_task(task_id: int) -> dict:
         """停止任务"""
         # 这里应该实现任务停止逻辑
-        async for db in get_db_session():
-            await TaskInfoDAO.update(db, task_id, {"enabled": False, "status": "STOPPED"})
+        async with get_db_session() as db:
+            # 条件更新：任务已停止时不产生写入
+            await TaskInfoDAO.set_state(db, task_id, False, "STOPPED")
             return {"success": True, "message": f"任务 {task_id} 已停止"}
\ No newline at end of file
@@ -0,0 +1 @@
+# 任务处理器模块，task_info.handler 只能指向本包（TASK_HANDLER_PREFIX）下的函数
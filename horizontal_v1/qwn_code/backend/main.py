@@ -1,18 +1,12 @@
-from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
+from starlette.middleware import Middleware
 from app.core.config.settings import settings
 from app.core.events import lifespan
 from app.api.v1.api import api_router
 from app.core.middlewares import RequestLoggingMiddleware
-from app.core.exceptions import register_exception_handlers
-
-
-@asynccontextmanager
-async def lifespan_wrapper(app: FastAPI):
-    """应用生命周期管理"""
-    async with lifespan(app) as manager:
-        yield manager
+from app.core.exceptions import EXCEPTION_HANDLERS
 
 
 def create_app() -> FastAPI:
@@ -21,27 +15,29 @@ def create_app() -> FastAPI:
         title=settings.PROJECT_NAME,
         version=settings.VERSION,
         description=settings.DESCRIPTION,
-        lifespan=lifespan_wrapper
-    )
-
-    # CORS 中间件
-    app.add_middleware(
-        CORSMiddleware,
-        allow_origins=settings.ALLOWED_ORIGINS,
-        allow_credentials=True,
-        allow_methods=["*"],
-        allow_headers=["*"],
+        lifespan=lifespan,
+        default_response_class=ORJSONResponse,
+        # 中间件按列表顺序由外到内包裹，启动时一次性构建
+        middleware=[
+            # 日志中间件在最外层，记录包括 CORS 预检在内的所有请求
+            Middleware(RequestLoggingMiddleware),
+            Middleware(
+                CORSMiddleware,
+                allow_origins=settings.ALLOWED_ORIGINS,
+                allow_credentials=True,
+                allow_methods=["*"],
+                allow_headers=["*"],
+            ),
+        ],
+        exception_handlers=EXCEPTION_HANDLERS
     )
 
-    # 添加日志中间件（应该在其他中间件之前）
-    app.add_middleware(RequestLoggingMiddleware)
-
-    # 注册异常处理器
-    register_exception_handlers(app)
-
     # 包含 API 路由
     app.include_router(api_router, prefix="/api/v1")
 
+    # 启动时构建一次 ASGI 中间件栈，首个请求无需再构建
+    app.middleware_stack = app.build_middleware_stack()
+
     return app
 
 
@@ -49,10 +45,15 @@ app = create_app()
 
 
 if __name__ == "__main__":
+    import os
     import uvicorn
     uvicorn.run(
         "main:app",
         host=settings.HOST,
         port=settings.PORT,
-        reload=settings.RELOAD
+        reload=settings.RELOAD,
+        # 热重载只支持单进程；生产环境关闭 RELOAD 后按 CPU 核数启动多进程
+        workers=1 if settings.RELOAD else (settings.WORKERS or os.cpu_count() or 1),
+        loop="uvloop",
+        http="httptools"
     )
\ No newline at end of file
@@ -0,0 +1,82 @@
+from contextlib import asynccontextmanager
+import pytest
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.pool import StaticPool
+from app.models.base import Base
+
+
+@pytest.fixture
+def sqlite_session():
+    """返回一个异步上下文管理器：在内存 SQLite 中建好指定模型的表，产出会话"""
+    @asynccontextmanager
+    async def factory(*models):
+        engine = create_async_engine("sqlite+aiosqlite://", poolclass=StaticPool)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[model.__table__ for model in models])
+        try:
+            async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+                yield db
+        finally:
+            await engine.dispose()
+    return factory
+
+
+class FakePipeline:
+    """按顺序回放命令的假 pipeline"""
+
+    def __init__(self, redis):
+        self._redis = redis
+        self._commands = []
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self._commands.append((name, args, kwargs))
+
+    async def execute(self):
+        commands, self._commands = self._commands, []
+        return [await getattr(self._redis, name)(*args, **kwargs) for name, args, kwargs in commands]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeRedis:
+    """进程内的假 Redis，只实现用到的命令，行为与 decode_responses=True 的客户端一致（值统一存为字符串）"""
+
+    def __init__(self):
+        self.data = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def mget(self, keys):
+        return [self.data.get(key) for key in keys]
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value.decode() if isinstance(value, bytes) else str(value)
+
+    async def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1)
+        return int(self.data[key])
+
+    async def expire(self, key, seconds):
+        return key in self.data
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+@pytest.fixture
+def fake_redis(monkeypatch):
+    """用假 Redis 替换用户缓存与认证模块使用的客户端"""
+    from app.db.dao import user_dao
+    from app.services import auth
+    redis = FakeRedis()
+    monkeypatch.setattr(user_dao, "redis_client", redis)
+    monkeypatch.setattr(auth, "redis_client", redis)
+    return redis
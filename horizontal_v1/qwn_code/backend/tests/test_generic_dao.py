@@ -0,0 +1,93 @@
+import asyncio
+from sqlalchemy import select
+from app.db.dao.generic_dao import BaseDAO, COPY_THRESHOLD
+from app.models.rk import VendorContact
+
+
+class ContactDAO(BaseDAO[VendorContact]):
+    model = VendorContact
+
+
+class FakeCopySession:
+    """只记录 COPY 调用的假会话，走到 executemany INSERT 分支时直接报错"""
+
+    def __init__(self):
+        self.copies = []
+        self.committed = False
+        session = self
+
+        class Driver:
+            async def copy_records_to_table(self, table_name, records, columns):
+                session.copies.append((table_name, columns, records))
+
+        class Raw:
+            driver_connection = Driver()
+
+        class Connection:
+            async def get_raw_connection(self):
+                return Raw()
+
+        self._connection = Connection()
+
+    async def connection(self):
+        return self._connection
+
+    async def execute(self, *args, **kwargs):
+        raise AssertionError("达到阈值后不应走 INSERT")
+
+    async def commit(self):
+        self.committed = True
+
+
+def _contacts(count, **extra):
+    return [{"vendor_id": 1, "name": f"c{i}", **extra} for i in range(count)]
+
+
+def test_bulk_copy_empty_rows():
+    db = FakeCopySession()
+    assert asyncio.run(ContactDAO.bulk_copy(db, [])) == 0
+    assert db.copies == [] and not db.committed
+
+
+def test_bulk_copy_below_threshold_uses_insert(sqlite_session):
+    async def scenario():
+        async with sqlite_session(VendorContact) as db:
+            written = await ContactDAO.bulk_copy(db, _contacts(COPY_THRESHOLD - 1))
+            contacts = (await db.execute(select(VendorContact))).scalars().all()
+            return written, contacts
+
+    written, contacts = asyncio.run(scenario())
+    assert written == COPY_THRESHOLD - 1
+    assert len(contacts) == COPY_THRESHOLD - 1
+    # INSERT 分支由 SQLAlchemy 补齐 Python 侧默认值
+    assert all(contact.is_primary is False for contact in contacts)
+
+
+def test_bulk_copy_at_threshold_uses_copy_with_defaults():
+    db = FakeCopySession()
+    written = asyncio.run(ContactDAO.bulk_copy(db, _contacts(COPY_THRESHOLD)))
+
+    assert written == COPY_THRESHOLD
+    assert db.committed
+    assert len(db.copies) == 1
+    table_name, columns, records = db.copies[0]
+    assert table_name == "rk_vendor_contact"
+    assert columns == ["vendor_id", "name", "is_primary"]
+    assert records[0] == (1, "c0", False)
+    assert len(records) == COPY_THRESHOLD
+
+
+def test_bulk_copy_groups_mixed_key_sets():
+    rows = _contacts(60, email="a@example.com", is_primary=True) + _contacts(50)
+    db = FakeCopySession()
+    written = asyncio.run(ContactDAO.bulk_copy(db, rows))
+
+    assert written == 110
+    assert len(db.copies) == 2
+    (_, with_email, first), (_, without_email, second) = db.copies
+    assert with_email == ["vendor_id", "name", "email", "is_primary"]
+    assert first[0] == (1, "c0", "a@example.com", True)
+    # 缺少的列不出现在 COPY 列表中，交给数据库 server_default，而不是写成显式 NULL
+    assert without_email == ["vendor_id", "name", "is_primary"]
+    assert second[0] == (1, "c0", False)
+    assert len(first) == 60 and len(second) == 50
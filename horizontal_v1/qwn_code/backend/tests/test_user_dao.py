@@ -0,0 +1,115 @@
+import asyncio
+from sqlalchemy import insert, delete, update
+from app.db.dao.user_dao import UserDao
+from app.models.user import User
+
+
+USERS = [
+    {"id": 1, "phone": "13800138000", "email": "a@example.com", "full_name": "A", "hashed_password": "x"},
+    {"id": 2, "phone": "13800138001", "email": "b@example.com", "full_name": "B", "hashed_password": "x"},
+    {"id": 3, "phone": "13800138002", "email": None, "full_name": "C", "hashed_password": "x"},
+]
+
+
+def _run(sqlite_session, scenario):
+    async def main():
+        async with sqlite_session(User) as db:
+            await db.execute(insert(User), [dict(user) for user in USERS])
+            await db.commit()
+            return await scenario(db)
+    return asyncio.run(main())
+
+
+async def _drop_row(db, user_id):
+    """绕过 DAO 直接删库，之后仍能读到的数据只可能来自缓存"""
+    await db.execute(delete(User).where(User.id == user_id))
+    await db.commit()
+
+
+def test_get_by_id_reads_through_cache(sqlite_session, fake_redis):
+    async def scenario(db):
+        first = await UserDao.get_by_id(db, 1)
+        await _drop_row(db, 1)
+        second = await UserDao.get_by_id(db, 1)
+        return first, second
+
+    first, second = _run(sqlite_session, scenario)
+    assert first.full_name == "A"
+    assert second.full_name == "A" and second.is_active is True
+    assert fake_redis.data["user:phone:13800138000"] == "1"
+    assert fake_redis.data["user:email:a@example.com"] == "1"
+
+
+def test_get_by_phone_and_email_use_index_keys(sqlite_session, fake_redis):
+    async def scenario(db):
+        await UserDao.get_by_id(db, 1)
+        await _drop_row(db, 1)
+        return await UserDao.get_by_phone(db, "13800138000"), await UserDao.get_by_email(db, "a@example.com")
+
+    by_phone, by_email = _run(sqlite_session, scenario)
+    assert by_phone.id == 1 and by_email.id == 1
+
+
+def test_stale_phone_index_is_a_miss(sqlite_session, fake_redis):
+    async def scenario(db):
+        await UserDao.get_by_id(db, 1)
+        # 索引指向的用户已换了手机号：不能按旧号码返回该用户
+        await fake_redis.set("user:phone:13900000000", 1)
+        return await UserDao.get_by_phone(db, "13900000000")
+
+    assert _run(sqlite_session, scenario) is None
+
+
+def test_get_many_by_ids_backfills_misses(sqlite_session, fake_redis):
+    async def scenario(db):
+        await UserDao.get_by_id(db, 2)
+        await _drop_row(db, 2)
+        users = await UserDao.get_many_by_ids(db, [3, 2, 99, 1, 3])
+        # 补齐的用户已回填缓存，删库后仍可读到
+        await _drop_row(db, 1)
+        await _drop_row(db, 3)
+        refetched = await UserDao.get_many_by_ids(db, [1, 3])
+        return users, refetched
+
+    users, refetched = _run(sqlite_session, scenario)
+    # 保持请求顺序并去重，不存在的ID被跳过
+    assert [user.id for user in users] == [3, 2, 1]
+    assert [user.id for user in refetched] == [1, 3]
+
+
+def test_update_user_invalidates_cache(sqlite_session, fake_redis):
+    async def scenario(db):
+        await UserDao.get_by_id(db, 1)
+        await UserDao.update_user(db, 1, {"full_name": "A2", "is_active": False})
+        cached_after_update = fake_redis.data.get("user:id:1")
+        return cached_after_update, await UserDao.get_by_id(db, 1)
+
+    cached_after_update, user = _run(sqlite_session, scenario)
+    assert cached_after_update is None
+    assert user.full_name == "A2" and user.is_active is False
+    # 递增共享版本号，其他 worker 的进程内用户缓存随之失效
+    assert fake_redis.data["user:version:1"] == "1"
+
+
+def test_update_outside_dao_is_served_from_cache(sqlite_session, fake_redis):
+    async def scenario(db):
+        await UserDao.get_by_id(db, 1)
+        await db.execute(update(User).where(User.id == 1).values(full_name="changed"))
+        await db.commit()
+        return await UserDao.get_by_id(db, 1)
+
+    # 对照：不经过 DAO 的修改在缓存有效期内不可见，说明上面的失效确实来自 update_user
+    assert _run(sqlite_session, scenario).full_name == "A"
+
+
+def test_delete_user_invalidates_cache(sqlite_session, fake_redis):
+    async def scenario(db):
+        await UserDao.get_by_id(db, 1)
+        deleted = await UserDao.delete_user(db, 1)
+        return deleted, await UserDao.get_by_id(db, 1)
+
+    deleted, user = _run(sqlite_session, scenario)
+    assert deleted is True
+    assert user is None
+    assert "user:id:1" not in fake_redis.data
+    assert fake_redis.data["user:version:1"] == "1"